@@ -46,9 +46,14 @@ class Diagram(SupportsPositioning, Protocol):
         self.additional_keys = set(additional_keys or [])
         for key in self.additional_keys:
             setattr(self, f"_{key}", {})
+        self._bind_additional_keys()
+        self._rebind_methods()
+
+    def _bind_additional_keys(self):
+        # Accessors for additional keys, which must be rebound on each new instance
+        for key in self.additional_keys:
             setattr(self, f"{key}", lambda idx, _key=key: getattr(self, f"_{_key}").get(idx))
             setattr(self, f"set_{key}", lambda idx, arg, _key=key: getattr(self, f"_{_key}").update({idx: arg}) or self)
-        self._rebind_methods()
 
     def _rebind_methods(self):
         # Delegations from the wrapped graph, which must be rebound on each new instance
@@ -77,6 +82,47 @@ class Diagram(SupportsPositioning, Protocol):
         result._rebind_methods()  # noqa: SLF001
         return result
 
+    def clone(self) -> Self:
+        """
+        :return: An independent copy of this diagram, which preserves all node and edge indices. This is much faster
+            than a deepcopy, as only the graph structure and the per-node mappings are copied; mapped values are shared.
+        """
+        g = self._g.copy()
+        # Node data is mutable (see .add_to_phase), so it must not be shared between the copies
+        for idx in g.node_indices():
+            g[idx] = _NodeInfo(g[idx].type, g[idx].phase)
+
+        cls = self.__class__
+        result = cls.__new__(cls)
+        copied_attributes = {
+            "_g": g,
+            "_x": self._x.copy(),
+            "_y": self._y.copy(),
+            "_io": None if self._io is None else (list(self._io[0]), list(self._io[1])),
+            "_is_io_virtual": self._is_io_virtual,
+            "additional_keys": set(self.additional_keys),
+        }
+        for key in self.additional_keys:
+            copied_attributes[f"_{key}"] = getattr(self, f"_{key}").copy()
+        for k, v in copied_attributes.items():
+            setattr(result, k, v)
+        result._bind_additional_keys()  # noqa: SLF001
+        result._rebind_methods()  # noqa: SLF001
+        return result
+
+    def structural_key(self) -> tuple:
+        """
+        :return: A hashable description of the graph structure, i.e. node indices, types and phases, the endpoints of
+            all edges and the IO. Diagrams with equal keys are the same labelled graph, although they may number their
+            edges differently. Positions and additional keys are ignored.
+        """
+        return (
+            tuple((idx, self.type(idx), self.phase(idx)) for idx in self.node_indices()),
+            tuple(sorted((min(s, t), max(s, t)) for s, t in self.edge_list())),
+            None if self._io is None else (tuple(self._io[0]), tuple(self._io[1])),
+            self._is_io_virtual,
+        )
+
     def add_node(
         self,
         t: NodeType,
@@ -97,6 +143,24 @@ class Diagram(SupportsPositioning, Protocol):
 
         return idx
 
+    def add_nodes(
+        self, nodes: Iterable[tuple[NodeType, Fraction | None, float | int | None, float | int | None]]
+    ) -> list[int]:
+        """
+        Adds several nodes at once, each given as a tuple of the arguments ``t, phase, x, y`` of :meth:`add_node`.
+
+        :return: The indices of the new nodes, in the order given
+        """
+        nodes = list(nodes)
+        indices = list(self._g.add_nodes_from([_NodeInfo(t, phase or Fraction(0, 1)) for t, phase, _, _ in nodes]))
+        for idx, (_, _, x, y) in zip(indices, nodes):
+            if x is not None:
+                self._x[idx] = x
+            if y is not None:
+                self._y[idx] = y
+
+        return indices
+
     def remove_node(self, idx: int) -> None:
         self._g.remove_node(idx)
         self._x.pop(idx, "")
@@ -142,6 +206,10 @@ class Diagram(SupportsPositioning, Protocol):
 
         new_node_ids = self._g.compose(other._g, {i: (o, None) for i, o in node_map.items()})  # noqa: SLF001
         for other_node, new_this_node in new_node_ids.items():
+            # Node data is mutable (see .add_to_phase), so it must not be shared with the other diagram, which may be
+            # composed again
+            info = self._g[new_this_node]
+            self._g[new_this_node] = _NodeInfo(info.type, info.phase)
             self._x[new_this_node] = other._x[other_node]  # noqa: SLF001
             self._y[new_this_node] = other._y[other_node]  # noqa: SLF001
             for key in self.additional_keys.intersection(other.additional_keys):
@@ -176,14 +244,15 @@ class Diagram(SupportsPositioning, Protocol):
         Sets the boundary node indices regarded as inputs / outputs. Their order directly determines their index through
         isomorphic conversion to a states outputs, i.e. they are indexed as <...all-inputs><...all-outputs>.
         """
-        if not virtual and (len(set(inputs)) != len(inputs) or len(set(outputs)) != len(outputs)):
-            raise ValueError(
-                f"Real IO may not contain duplicate node indices. Unique I/O #:"
-                f" {len(set(inputs))}/{len(set(outputs))}, Given I/O # : {len(inputs)}/{len(outputs)}"
-            )
         boundaries = set(self.boundary_nodes())
         if not virtual:
-            unique_io = set(inputs).union(set(outputs))
+            unique_inputs, unique_outputs = set(inputs), set(outputs)
+            if len(unique_inputs) != len(inputs) or len(unique_outputs) != len(outputs):
+                raise ValueError(
+                    f"Real IO may not contain duplicate node indices. Unique I/O #:"
+                    f" {len(unique_inputs)}/{len(unique_outputs)}, Given I/O # : {len(inputs)}/{len(outputs)}"
+                )
+            unique_io = unique_inputs | unique_outputs
             if unique_io != boundaries:
                 raise ValueError(
                     f"The provided IO must be a 1-1 allocation of boundary nodes, or be virtual. "
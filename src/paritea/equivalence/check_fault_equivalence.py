@@ -29,9 +29,6 @@ class AugmentedStabilisers:
 
         return self
 
-    def normalise_single(self, compiled_fault: GF2) -> GF2:  # TODO remove
-        return self.normalise(GF2([compiled_fault]))[0]
-
     def normalise(self, compiled_faults: GF2) -> GF2:
         return compiled_faults + compiled_faults[:, self._indices] @ self._rref
 
@@ -56,14 +53,24 @@ def _compile_atomic_faults(
     boundaries_to_idx: Mapping[int, int],
     detector_to_idx: Mapping[int, int],
 ) -> list[tuple[int, int]]:
-    normalised_faults: list[tuple[int, int]] = []
+    faults: list[Fault] = []
+    fault_values: list[list[int]] = []
     for f, vs in noise.atomic_faults_with_values():
         if f.is_trivial():
             continue
 
-        compiled = f.compile(boundaries_to_idx, detector_to_idx)
-        normalised = stabilisers.normalise_single(compiled)
-        normalised_int = Fault.compiled_to_int(normalised)
+        faults.append(f)
+        fault_values.append(vs)
+
+    if len(faults) == 0:
+        return []
+
+    # Compile and normalise all faults in a single matrix operation instead of one per fault
+    normalised = stabilisers.normalise(GF2(Fault.compile_all(faults, boundaries_to_idx, detector_to_idx)))
+
+    normalised_faults: list[tuple[int, int]] = []
+    for normalised_fault, vs in zip(normalised, fault_values):
+        normalised_int = Fault.compiled_to_int(normalised_fault)
         normalised_faults.extend((normalised_int, v) for v in vs)
 
     return normalised_faults
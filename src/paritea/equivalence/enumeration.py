@@ -1,11 +1,13 @@
 import itertools
 import math
+import operator
 import time
-from collections.abc import Iterator
 from dataclasses import dataclass, field
 
 from tqdm.auto import tqdm
 
+from paritea.util import bit_indices, gf2_rank
+
 
 def _format_sig(sig: int, boundaries: int, sinks: int) -> str:
     sig_str = format(sig, "b").zfill(boundaries * 2 + sinks)
@@ -21,17 +23,46 @@ class AtomicFaults:
     weight_lookup: dict[int, int] = field(default_factory=dict, init=False)
     undetectable: set[int] = field(default_factory=set, init=False)
     detectable_with_detectors: dict[int, int] = field(default_factory=dict, init=False)
+    # Undetectable signatures grouped by their current weight, such that combinations can be formed group-wise
+    undetectable_by_weight: dict[int, set[int]] = field(default_factory=dict, init=False)
+    # Detectable signatures by each detector they flip, such that overlaps only consider signatures sharing a detector
+    detectable_by_detector: dict[int, list[int]] = field(default_factory=dict, init=False)
+
+    def build_groups(self) -> None:
+        self.undetectable_by_weight = {}
+        for sig in self.undetectable:
+            self.undetectable_by_weight.setdefault(self.weight_lookup[sig], set()).add(sig)
 
-    def all_iter(self) -> Iterator[tuple[int, int]]:
-        for sig in itertools.chain(self.undetectable, self.detectable_with_detectors.keys()):
-            yield sig, self.weight_lookup[sig]
+        self.detectable_by_detector = {}
+        for sig, sig_info in self.detectable_with_detectors.items():
+            for detector in bit_indices(sig_info):
+                self.detectable_by_detector.setdefault(detector, []).append(sig)
+
+    def lower_weight(self, sig: int, w: int) -> None:
+        """Lowers the weight of the atomic signature sig to w, which must be below its current weight."""
+        if sig in self.undetectable:
+            previous = self.undetectable_by_weight[self.weight_lookup[sig]]
+            previous.discard(sig)
+            if len(previous) == 0:
+                del self.undetectable_by_weight[self.weight_lookup[sig]]
+            self.undetectable_by_weight.setdefault(w, set()).add(sig)
+        self.weight_lookup[sig] = w
+
+    def num_undetectable_combinations(self) -> int:
+        """:return: The number of distinct undetectable signatures (including the trivial one) spanned by the faults"""
+        # Undetectable combinations form the subspace of the span whose detector flips cancel
+        rank = gf2_rank(itertools.chain(self.undetectable, self.detectable_with_detectors.keys()))
+        detector_rank = gf2_rank(self.detectable_with_detectors.values())
+        return 1 << (rank - detector_rank)
 
     def detector_overlapping(self, detector_info: int) -> list[int]:
+        candidates = set()
+        for detector in bit_indices(detector_info):
+            candidates.update(self.detectable_by_detector.get(detector, ()))
+
         lowest_weight = math.inf
         lowest_weight_sigs = []
-        for sig, sig_info in self.detectable_with_detectors.items():
-            if detector_info & sig_info == 0:
-                continue
+        for sig in candidates:
             w = self.weight_lookup[sig]
             if w > lowest_weight:
                 continue
@@ -47,30 +78,28 @@ class AtomicFaults:
 def prepare_atomic_faults(nm_sigs: list[tuple[int, int]], *, num_detectors: int) -> AtomicFaults:
     atomics: AtomicFaults = AtomicFaults()
     detector_mask = (1 << num_detectors) - 1
-    for sig, v in nm_sigs:
-        detectable = sig & detector_mask > 0
-        if detectable:
-            if sig not in atomics.detectable_with_detectors:
-                atomics.detectable_with_detectors[sig] = sig & detector_mask
-                atomics.weight_lookup[sig] = v
-        else:
-            if sig not in atomics.undetectable:
-                atomics.undetectable.add(sig)
-                atomics.weight_lookup[sig] = v
 
-        if atomics.weight_lookup[sig] <= v:
-            continue
-        atomics.weight_lookup[sig] = v
+    # Keep the lowest weight per signature: with the faults ordered by descending weight, the dict keeps the last
+    atomics.weight_lookup = dict(sorted(nm_sigs, key=operator.itemgetter(1), reverse=True))
+    # Faults that normalise to the trivial signature lie in the span of every set of faults: combining with them only
+    # reproduces a signature at no lower weight, so they are dropped rather than unfolded
+    atomics.weight_lookup.pop(0, None)
+    for sig in atomics.weight_lookup:
+        detector_info = sig & detector_mask
+        if detector_info > 0:
+            atomics.detectable_with_detectors[sig] = detector_info
+        else:
+            atomics.undetectable.add(sig)
 
+    atomics.build_groups()
     return atomics
 
 
 def prepare_priority_queue(atomics: AtomicFaults) -> dict[int, set[int]]:
-    pq: dict[int, set[int]] = {}
-    for sig, v in atomics.all_iter():
-        if v not in pq:
-            pq[v] = set()
-        pq[v].add(sig)
+    # Undetectable faults are already grouped by weight, so each of their buckets is copied in one go
+    pq: dict[int, set[int]] = {v: set(sigs) for v, sigs in atomics.undetectable_by_weight.items()}
+    for sig in atomics.detectable_with_detectors:
+        pq.setdefault(atomics.weight_lookup[sig], set()).add(sig)
 
     return pq
 
@@ -120,18 +149,22 @@ def _next_gen_unfold(
                 undetectables_generated.add(sig_no_sinks)
 
             if sig in atomics.weight_lookup and atomics.weight_lookup[sig] > w:
-                atomics.weight_lookup[sig] = w
-
-            atomic_faults = atomics.undetectable if not detectable else atomics.detector_overlapping(detector_info)
-            for atomic_sig in atomic_faults:
-                comb_w = atomics.weight_lookup[atomic_sig] + w
-                if comb_w == w:
-                    new_queue.add(atomic_sig ^ sig)
-                    sigs_pgb.update(n=1)
+                atomics.lower_weight(sig, w)
+
+            # Combine with atomic faults group-wise by weight, so that the combinations of a group are formed and
+            # inserted in one call rather than one at a time
+            if detectable:
+                overlapping = atomics.detector_overlapping(detector_info)
+                groups = [(atomics.weight_lookup[overlapping[0]], overlapping)] if len(overlapping) > 0 else []
+            else:
+                groups = list(atomics.undetectable_by_weight.items())
+            for atomic_w, atomic_sigs in groups:
+                combined = map(sig.__xor__, atomic_sigs)
+                if atomic_w == 0:
+                    new_queue.update(combined)
+                    sigs_pgb.update(n=len(atomic_sigs))
                 else:
-                    if comb_w not in pq:
-                        pq[comb_w] = set()
-                    pq[comb_w].add(atomic_sig ^ sig)
+                    pq.setdefault(atomic_w + w, set()).update(combined)
         queue = new_queue
     end_time = time.time()
     sigs_pgb.close()
@@ -180,6 +213,10 @@ def _next_gen_strategy(
     nm2_atomics = prepare_atomic_faults(nm2_sigs, num_detectors=d2_detectors)
     nm2_pq = prepare_priority_queue(nm2_atomics)
 
+    # Once a lookup holds every undetectable signature its faults span, it can neither gain nor improve any more
+    nm1_max_undetectable = nm1_atomics.num_undetectable_combinations()
+    nm2_max_undetectable = nm2_atomics.num_undetectable_combinations()
+
     w = 0
     w_pgb = tqdm(
         desc="Current weight", initial=0, leave=False, disable=quiet, unit="", bar_format="{desc}: {n_fmt}", ncols=0
@@ -216,23 +253,31 @@ def _next_gen_strategy(
                 f"Finished unfolding weight {w} in queue 2! Next items remaining: {len(nm2_pq.get(w + 1, []))}..."
             )
 
-        for sig in nm1_undetectable:
-            if sig not in nm2_undetectable_lookup:
-                if not quiet:
-                    tqdm.write(
-                        f"{_format_sig(sig, d1_boundaries, 0)} from nm1 has no equivalent in nm2, or it was not "
-                        f"yet generated and thus has higher weight!"
-                    )
-                return w
-
-        for sig in nm2_undetectable:
-            if sig not in nm1_undetectable_lookup:
-                if not quiet:
-                    tqdm.write(
-                        f"{_format_sig(sig, d2_boundaries, 0)} from nm2 has no equivalent in nm1, or it was not "
-                        f"yet generated and thus has higher weight!"
-                    )
-                return w
+        nm1_missing = nm1_undetectable - nm2_undetectable_lookup.keys()
+        if len(nm1_missing) > 0:
+            if not quiet:
+                tqdm.write(
+                    f"{_format_sig(next(iter(nm1_missing)), d1_boundaries, 0)} from nm1 has no equivalent in nm2, "
+                    f"or it was not yet generated and thus has higher weight!"
+                )
+            return w
+
+        nm2_missing = nm2_undetectable - nm1_undetectable_lookup.keys()
+        if len(nm2_missing) > 0:
+            if not quiet:
+                tqdm.write(
+                    f"{_format_sig(next(iter(nm2_missing)), d2_boundaries, 0)} from nm2 has no equivalent in nm1, "
+                    f"or it was not yet generated and thus has higher weight!"
+                )
+            return w
+
+        if (
+            len(nm1_undetectable_lookup) == nm1_max_undetectable
+            and len(nm2_undetectable_lookup) == nm2_max_undetectable
+        ):
+            if not quiet:
+                tqdm.write(f"All undetectable signatures were generated by weight {w}!")
+            break
     w_pgb.close()
 
     return None
@@ -59,6 +59,8 @@ def build_flip_operators(d: Diagram) -> FlipOperators:
 
     stabs, regions = compute_pauli_webs(d)
 
-    stab_flip_ops, stab_gen_set = _flip_operators(stabs, lambda w: w.restrict(d.boundary_edges()))
+    # The restriction is applied to every generator pair, so only look up the boundary edges once
+    boundary_edges = d.boundary_edges()
+    stab_flip_ops, stab_gen_set = _flip_operators(stabs, lambda w: w.restrict(boundary_edges))
 
     return FlipOperators(d, stab_flip_ops, stab_gen_set, regions)
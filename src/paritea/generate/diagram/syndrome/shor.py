@@ -14,6 +14,7 @@ def shor_extraction(
     repeat: int = 1,
     partition: Literal[False] = False,
     granular: bool = False,
+    minimal_cat_state: bool = False,
 ) -> Diagram: ...
 @overload
 def shor_extraction(
@@ -23,6 +24,7 @@ def shor_extraction(
     repeat: int = 1,
     partition: Literal[True],
     granular: bool = False,
+    minimal_cat_state: bool = False,
 ) -> tuple[Diagram, list[list[int]]]: ...
 def shor_extraction(
     stabilisers: list[PauliString],
@@ -31,6 +33,7 @@ def shor_extraction(
     repeat: int = 1,
     partition: bool = False,
     granular: bool = False,
+    minimal_cat_state: bool = False,
 ) -> Diagram | tuple[Diagram, list[list[int]]]:
     """
     Generates a ZX diagram measuring the given stabilisers one-by-one using Shor-style syndrome extraction. Diagrams are
@@ -41,6 +44,9 @@ def shor_extraction(
     :param partition: Whether to return partitions for the diagram.
     :param granular: Whether to take a partition to be an entire measurement round (False) or an individual stabiliser
     measurement (True).
+    :param minimal_cat_state: Whether to only prepare cat state qubits for the qubits a stabiliser acts on (True), or
+    for all qubits (False). Both diagrams are equal up to a scalar, but the minimal one has fewer nodes and edges and
+    thus fewer fault locations.
     """
 
     d = Diagram()
@@ -51,63 +57,21 @@ def shor_extraction(
     node_list: list[list[int]] = []
     row_offset += 1
 
+    # Every round measures the same stabilisers, so each measurement is generated once and composed in every round
+    measurements = [
+        _stabiliser_measurement(stabiliser, qubits, minimal_cat_state=minimal_cat_state) for stabiliser in stabilisers
+    ]
     for _ in range(repeat):
         new_nodes = []
-        for stabiliser in stabilisers:
-            stabiliser_diagram = Diagram()
-            first = [-1 for _ in range(qubits)]
-            last = [-1 for _ in range(qubits)]
-            controls = [-1 for _ in range(qubits)]
-
-            cat_z = stabiliser_diagram.add_node(NodeType.Z, x=row_offset, y=qubits + 2 + qubits / 2)
-            row_offset += 1
-
-            # Generate Pauli boxes
-            for idx, pauli in stabiliser.items():
-                if pauli == Pauli.I:
-                    continue
-
-                target_node = stabiliser_diagram.add_node(NodeType.X, x=row_offset, y=idx)
-                c = stabiliser_diagram.add_node(NodeType.Z, x=row_offset, y=idx + qubits + 1)
-                stabiliser_diagram.add_edge(target_node, c)
-
-                if pauli == Pauli.X:
-                    h1 = stabiliser_diagram.add_node(NodeType.H, x=row_offset - 0.5, y=idx)
-                    h2 = stabiliser_diagram.add_node(NodeType.H, x=row_offset + 0.5, y=idx)
-                    stabiliser_diagram.add_edge(target_node, h1)
-                    stabiliser_diagram.add_edge(target_node, h2)
-                    first[idx] = h1
-                    last[idx] = h2
-                elif pauli == Pauli.Y:
-                    x1 = stabiliser_diagram.add_node(NodeType.X, phase=Fraction(1, 2), x=row_offset - 0.5, y=idx)
-                    x2 = stabiliser_diagram.add_node(NodeType.X, phase=Fraction(-1, 2), x=row_offset + 0.5, y=idx)
-                    stabiliser_diagram.add_edge(target_node, x1)
-                    stabiliser_diagram.add_edge(target_node, x2)
-                    first[idx] = x1
-                    last[idx] = x2
-                else:
-                    first[idx] = target_node
-                    last[idx] = target_node
-
-                controls[idx] = c
-                row_offset += 1
-
-            # Connect to cat state
-            for i, c in enumerate(controls):
-                h = stabiliser_diagram.add_node(NodeType.H, x=row_offset, y=qubits + i + 1)
-                measure = stabiliser_diagram.add_node(NodeType.X, x=row_offset + 1, y=qubits + i + 1)
-                stabiliser_diagram.add_edge(h, measure)
-                if c == -1:
-                    stabiliser_diagram.add_edge(cat_z, h)
-                else:
-                    stabiliser_diagram.add_edge(cat_z, c)
-                    stabiliser_diagram.add_edge(c, h)
-
-            row_offset += 2
-
-            # Append to overall diagram
-            trans = d.compose(stabiliser_diagram, {b: n for b, n in zip(current_qubit_nodes, first) if n != -1})
-            current_qubit_nodes = [trans[n] if n != -1 else current_qubit_nodes[i] for i, n in enumerate(last)]
+        for stabiliser_diagram, involved, width in measurements:
+            # Append to overall diagram, moving the measurement to the current row
+            trans = d.compose(stabiliser_diagram, {current_qubit_nodes[i]: f for i, f, _ in involved})
+            for n in trans.values():
+                d.set_x(n, d.x(n) + row_offset)
+            row_offset += width
+
+            for i, _, l in involved:
+                current_qubit_nodes[i] = trans[l]
             if granular:
                 node_list.append(list(trans.values()))
             else:
@@ -129,3 +93,80 @@ def shor_extraction(
         return d, node_list
 
     return d
+
+
+def _stabiliser_measurement(
+    stabiliser: PauliString, qubits: int, *, minimal_cat_state: bool
+) -> tuple[Diagram, list[tuple[int, int, int]], int]:
+    """
+    Generates the measurement of a single stabiliser, with rows counted from zero.
+
+    :return: The measurement diagram, the first and last node on each qubit it acts on as ``(qubit, first, last)`` in
+        ascending qubit order, and the number of rows it occupies
+    """
+    # Nodes and edges are collected first and added in bulk, with nodes referred to by their position in the list
+    nodes: list[tuple[NodeType, Fraction | None, float | int, float | int]] = []
+    edges: list[tuple[int, int]] = []
+
+    def add_node(t: NodeType, x: float | int, y: float | int, phase: Fraction | None = None) -> int:
+        nodes.append((t, phase, x, y))
+        return len(nodes) - 1
+
+    row_offset = 0
+    # Only the qubits the stabiliser acts on are assigned
+    first: dict[int, int] = {}
+    last: dict[int, int] = {}
+    controls: dict[int, int] = {}
+
+    cat_z = add_node(NodeType.Z, x=row_offset, y=qubits + 2 + qubits / 2)
+    row_offset += 1
+
+    # Generate Pauli boxes
+    for idx, pauli in stabiliser.items():
+        if pauli == Pauli.I:
+            continue
+
+        target_node = add_node(NodeType.X, x=row_offset, y=idx)
+        c = add_node(NodeType.Z, x=row_offset, y=idx + qubits + 1)
+        edges.append((target_node, c))
+
+        if pauli == Pauli.X:
+            h1 = add_node(NodeType.H, x=row_offset - 0.5, y=idx)
+            h2 = add_node(NodeType.H, x=row_offset + 0.5, y=idx)
+            edges.extend([(target_node, h1), (target_node, h2)])
+            first[idx] = h1
+            last[idx] = h2
+        elif pauli == Pauli.Y:
+            x1 = add_node(NodeType.X, phase=Fraction(1, 2), x=row_offset - 0.5, y=idx)
+            x2 = add_node(NodeType.X, phase=Fraction(-1, 2), x=row_offset + 0.5, y=idx)
+            edges.extend([(target_node, x1), (target_node, x2)])
+            first[idx] = x1
+            last[idx] = x2
+        else:
+            first[idx] = target_node
+            last[idx] = target_node
+
+        controls[idx] = c
+        row_offset += 1
+
+    # Connect to cat state
+    for i in range(qubits):
+        c = controls.get(i)
+        if c is None and minimal_cat_state:
+            continue  # The cat state qubit would be measured straight away, which only contributes a scalar
+        h = add_node(NodeType.H, x=row_offset, y=qubits + i + 1)
+        measure = add_node(NodeType.X, x=row_offset + 1, y=qubits + i + 1)
+        edges.append((h, measure))
+        if c is None:
+            edges.append((cat_z, h))
+        else:
+            edges.extend([(cat_z, c), (c, h)])
+
+    stabiliser_diagram = Diagram()
+    indices = stabiliser_diagram.add_nodes(nodes)
+    stabiliser_diagram.add_edges([(indices[a], indices[b]) for a, b in edges])
+    involved = [(i, indices[first[i]], indices[last[i]]) for i in sorted(first)]
+
+    row_offset += 2
+
+    return stabiliser_diagram, involved, row_offset
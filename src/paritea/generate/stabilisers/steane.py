@@ -1,16 +1,19 @@
 from paritea import PauliString
 
+# Pauli strings are immutable, so they are built once and shared between calls
+_STEANE_CODE_STABILISERS = (
+    PauliString("IIIXXXX"),
+    PauliString("IXXIIXX"),
+    PauliString("XIXIXIX"),
+    PauliString("IIIZZZZ"),
+    PauliString("IZZIIZZ"),
+    PauliString("ZIZIZIZ"),
+)
+
 
 def steane_code_stabilisers() -> list[PauliString]:
     """
     The stabilisers of the 7-qubit CSS Steane code.
     """
 
-    return [
-        PauliString("IIIXXXX"),
-        PauliString("IXXIIXX"),
-        PauliString("XIXIXIX"),
-        PauliString("IIIZZZZ"),
-        PauliString("IZZIIZZ"),
-        PauliString("ZIZIZIZ"),
-    ]
+    return list(_STEANE_CODE_STABILISERS)
@@ -1,3 +1,7 @@
+from functools import cache
+
+import numpy as np
+
 from paritea import Pauli, PauliString
 
 
@@ -5,33 +9,39 @@ def rotated_planar_surface_code_stabilisers(L: int) -> list[PauliString]:
     """
     Generates the stabilisers (plaquettes) of an LxL rotated planar surface code, using row-major qubit indexing.
     """
+    # Pauli strings are immutable, so the cached plaquettes can be shared and only the list is fresh per call
+    return list(_rotated_planar_surface_code_stabilisers(L))
 
-    plaquettes = []
-
-    def qubit(x: int, y: int) -> int:
-        return x + y * L
-
-    # Generate bulk plaquettes in checkerboard, starting with X
-    for i in range(L - 1):
-        for j in range(L - 1):
-            p_type = Pauli.X if (i + j) % 2 == 0 else Pauli.Z
-            plaquettes.append(
-                PauliString(
-                    {qubit(i, j): p_type, qubit(i + 1, j): p_type, qubit(i, j + 1): p_type, qubit(i + 1, j + 1): p_type}
-                )
-            )
 
-    # Generate boundary plaquettes
+@cache
+def _rotated_planar_surface_code_stabilisers(L: int) -> tuple[PauliString, ...]:
+    plaquettes = []
+    # Plaquettes never contain identities, so they skip the filtering done by the PauliString constructor
+    pauli_string = PauliString._from_trusted  # noqa: SLF001
+
+    # Generate bulk plaquettes in checkerboard, starting with X, from the corner qubits of all plaquettes at once
+    i, j = np.meshgrid(np.arange(L - 1), np.arange(L - 1), indexing="ij")
+    top_left = (i + j * L).ravel()
+    corners = np.stack([top_left, top_left + 1, top_left + L, top_left + L + 1], axis=1)
+    is_x = ((i + j) % 2 == 0).ravel()
+    for qubits, x in zip(corners.tolist(), is_x.tolist()):
+        p_type = Pauli.X if x else Pauli.Z
+        plaquettes.append(pauli_string(dict.fromkeys(qubits, p_type)))
+
+    # Generate boundary plaquettes, with qubit x + y * L at column x of row y
     for i in range(0, L - 1, 2):
         # Top Z plaquette
-        plaquettes.append(PauliString({qubit(i, 0): Pauli.Z, qubit(i + 1, 0): Pauli.Z}))
+        plaquettes.append(pauli_string({i: Pauli.Z, i + 1: Pauli.Z}))
         # Right X plaquette
-        plaquettes.append(PauliString({qubit(L - 1, i): Pauli.X, qubit(L - 1, i + 1): Pauli.X}))
+        right = L - 1 + i * L
+        plaquettes.append(pauli_string({right: Pauli.X, right + L: Pauli.X}))
 
     for i in range(1, L, 2):
         # Bottom Z plaquette
-        plaquettes.append(PauliString({qubit(i, L - 1): Pauli.Z, qubit(i + 1, L - 1): Pauli.Z}))
+        bottom = i + (L - 1) * L
+        plaquettes.append(pauli_string({bottom: Pauli.Z, bottom + 1: Pauli.Z}))
         # Left X plaquette
-        plaquettes.append(PauliString({qubit(0, i): Pauli.X, qubit(0, i + 1): Pauli.X}))
+        left = i * L
+        plaquettes.append(pauli_string({left: Pauli.X, left + L: Pauli.X}))
 
-    return plaquettes
+    return tuple(plaquettes)
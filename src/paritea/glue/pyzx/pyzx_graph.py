@@ -126,8 +126,9 @@ def to_pyzx(d: Diagram, *, with_mapping: bool = False) -> BaseGraph | tuple[Base
 
     mapping: dict[int, int] = {}
 
+    has_pyzx_index = hasattr(d, "pyzx_index")
     for n in d.node_indices():
-        if hasattr(d, "pyzx_index"):
+        if has_pyzx_index:
             if d.pyzx_index(n) is not None:
                 pyzx_id = d.pyzx_index(n)
                 g.add_vertex_indexed(pyzx_id)
@@ -1,6 +1,7 @@
-from .model import Fault, NoiseModel
+from .model import Fault, NoiseModel, Reducer
 
 __all__ = [
     "Fault",
     "NoiseModel",
+    "Reducer",
 ]
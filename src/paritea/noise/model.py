@@ -1,14 +1,36 @@
-from collections import defaultdict
+import operator
 from collections.abc import Callable, Iterable, Mapping
-from functools import reduce
+from enum import StrEnum
+from functools import cache, partial, reduce
 from typing import NamedTuple
 
-from galois import GF2
+import numpy as np
 
 from paritea.diagram import Diagram
 from paritea.pauli import Pauli, PauliString
 
 
+def _lookup_table(idx_map: Mapping[int, int]) -> np.ndarray:
+    """
+    Translates an index map with non-negative keys into an array, such that ``table[key] == idx_map[key]``. Keys that
+    are not in the map are -1.
+    """
+    table = np.full(max(idx_map.keys(), default=-1) + 1, -1, dtype=np.intp)
+    table[list(idx_map.keys())] = list(idx_map.values())
+    return table
+
+
+def _look_up(table: np.ndarray, keys: list[int]) -> np.ndarray:
+    """:return: The entries of a lookup table for the given keys, raising a KeyError for keys not in its index map"""
+    keys_array = np.asarray(keys, dtype=np.intp)
+    values = np.full(len(keys_array), -1, dtype=np.intp)
+    in_table = keys_array < len(table)
+    values[in_table] = table[keys_array[in_table]]
+    if (values < 0).any():
+        raise KeyError(int(keys_array[np.argmax(values < 0)]))
+    return values
+
+
 class Fault(NamedTuple):
     """
     A fault, described by 1. diagram edges it flips and 2. detectors it violates / flips.
@@ -21,36 +43,124 @@ class Fault(NamedTuple):
     detector_flips: frozenset[int] = frozenset()
 
     @staticmethod
+    @cache  # Faults are immutable, so single edge flips can be shared between all noise models
     def edge_flip(edge_idx: int, flip: Pauli) -> "Fault":
+        if flip == Pauli.I:
+            return Fault(PauliString(), frozenset())
         return Fault(PauliString.unary(edge_idx, flip), frozenset())
 
+    def detector_bits(self) -> int:
+        """:return: The flipped detectors as a bitmask, where bit ``i`` is set iff detector ``i`` is flipped."""
+        bits = 0
+        for detector in self.detector_flips:
+            bits |= 1 << detector
+        return bits
+
     def is_trivial(self) -> bool:
         return len(self.detector_flips) == 0 and self.edge_flips.is_trivial()
 
-    def compile(self, edge_idx_map: Mapping[int, int], detector_idx_map: Mapping[int, int]) -> GF2:
+    def compile(self, edge_idx_map: Mapping[int, int], detector_idx_map: Mapping[int, int]) -> np.ndarray:
+        """
+        :return: The fault as a uint8 bit vector of its Z edge flips, X edge flips and detector flips, in the order of
+            the index maps. Wrap the result in GF2 where it takes part in linear algebra.
+        """
         num_edges = len(edge_idx_map)
-        compiled = GF2.Zeros(num_edges * 2 + len(detector_idx_map))
-        for edge, pauli in self.edge_flips.items():
-            idx = edge_idx_map[edge]
-            if pauli == Pauli.Z or pauli == Pauli.Y:
-                compiled[idx] = 1
-            if pauli == Pauli.X or pauli == Pauli.Y:
-                compiled[idx + num_edges] = 1
+        edge_flips = self.edge_flips.items()
+        # Gather all set bits first so that the vector is written with a single indexed assignment
+        set_bits = [edge_idx_map[edge] for edge, pauli in edge_flips if pauli != Pauli.X]
+        set_bits.extend(edge_idx_map[edge] + num_edges for edge, pauli in edge_flips if pauli != Pauli.Z)
+        set_bits.extend(detector_idx_map[detector] + num_edges * 2 for detector in self.detector_flips)
 
-        for detector in self.detector_flips:
-            compiled[detector_idx_map[detector] + num_edges * 2] = 1
+        compiled = np.zeros(num_edges * 2 + len(detector_idx_map), dtype=np.uint8)
+        compiled[set_bits] = 1
+
+        return compiled
+
+    @staticmethod
+    def compile_all(
+        faults: Iterable["Fault"], edge_idx_map: Mapping[int, int], detector_idx_map: Mapping[int, int]
+    ) -> np.ndarray:
+        """
+        Compiles several faults into the rows of a single matrix, with the same layout as :meth:`Fault.compile`.
+
+        The index maps are only translated into lookup tables once, which is considerably faster than compiling each
+        fault on its own when many faults are compiled against the same maps.
+        """
+        num_edges = len(edge_idx_map)
+        edge_lookup = _lookup_table(edge_idx_map)
+        detector_lookup = _lookup_table(detector_idx_map)
+
+        # Collect (row, key) pairs per bit kind, then translate all keys to columns at once
+        z_rows, z_edges, x_rows, x_edges, d_rows, d_detectors = [], [], [], [], [], []
+        num_faults = 0
+        for row, fault in enumerate(faults):
+            num_faults += 1
+            for edge, pauli in fault.edge_flips.items():
+                if pauli != Pauli.X:
+                    z_rows.append(row)
+                    z_edges.append(edge)
+                if pauli != Pauli.Z:
+                    x_rows.append(row)
+                    x_edges.append(edge)
+            d_rows.extend([row] * len(fault.detector_flips))
+            d_detectors.extend(fault.detector_flips)
+
+        rows = np.concatenate([z_rows, x_rows, d_rows]).astype(np.intp)
+        cols = np.concatenate(
+            [
+                _look_up(edge_lookup, z_edges),
+                _look_up(edge_lookup, x_edges) + num_edges,
+                _look_up(detector_lookup, d_detectors) + num_edges * 2,
+            ]
+        ).astype(np.intp)
+
+        compiled = np.zeros((num_faults, num_edges * 2 + len(detector_idx_map)), dtype=np.uint8)
+        compiled[rows, cols] = 1
 
         return compiled
 
     @staticmethod
-    def compiled_to_int(compiled: GF2) -> int:
-        out = 0
-        for bit in compiled.tolist():
-            out = (out << 1) | bit
-        return out
+    def compiled_to_int(compiled: np.ndarray) -> int:
+        """Interprets the compiled fault as a bit string, where the first entry is the most significant bit."""
+        num_bits = len(compiled)
+        if num_bits == 0:
+            return 0
+        packed = np.packbits(compiled.view(np.ndarray).astype(np.uint8, copy=False))
+        # packbits zero-pads the last byte at its low end
+        return int.from_bytes(packed.tobytes(), "big") >> (len(packed) * 8 - num_bits)
 
     def to_int(self, edge_idx_map: Mapping[int, int], detector_idx_map: Mapping[int, int]) -> int:
-        return Fault.compiled_to_int(self.compile(edge_idx_map, detector_idx_map))
+        """Same as ``Fault.compiled_to_int(self.compile(...))``, but sets the bits directly without a vector."""
+        num_edges = len(edge_idx_map)
+        # Entry k of the compiled fault becomes bit (top - k) of the integer
+        top = num_edges * 2 + len(detector_idx_map) - 1
+        bits = 0
+        for edge, pauli in self.edge_flips.items():
+            idx = edge_idx_map[edge]
+            if pauli != Pauli.X:
+                bits |= 1 << (top - idx)
+            if pauli != Pauli.Z:
+                bits |= 1 << (top - idx - num_edges)
+        for detector in self.detector_flips:
+            bits |= 1 << (top - num_edges * 2 - detector_idx_map[detector])
+
+        return bits
+
+
+class Reducer(StrEnum):
+    """Common ways of combining the values of a fault, which :meth:`NoiseModel.compress` evaluates without callbacks."""
+
+    SUM = "sum"
+    MAX = "max"
+    PROB_OR = "prob_or"
+    """Probability of at least one of several independent events, i.e. ``a + b - ab`` folded over all values"""
+
+
+def _reduce_prob_or(values: list[float]) -> float:
+    acc = 0.0
+    for v in values:
+        acc = acc + v - acc * v
+    return acc
 
 
 class NoiseModel[T]:
@@ -63,17 +173,18 @@ class NoiseModel[T]:
         w_x: int | None = None,
         w_y: int | None = None,
         w_z: int | None = None,
-        idealised_edges: list[int] | None = None,
+        idealised_edges: Iterable[int] | None = None,
     ) -> "NoiseModel[int]":
-        idealised_edges = idealised_edges or []
-        atomic_faults: dict[Fault, list[int]] = defaultdict(list)
-        for edge_idx in diagram.edge_indices():
-            if edge_idx in idealised_edges:
-                continue
-
-            atomic_faults[Fault.edge_flip(edge_idx, Pauli.X)].append(w_x or 1)
-            atomic_faults[Fault.edge_flip(edge_idx, Pauli.Y)].append(w_y or 1)
-            atomic_faults[Fault.edge_flip(edge_idx, Pauli.Z)].append(w_z or 1)
+        idealised = frozenset(idealised_edges or ())
+        flips = ((Pauli.X, w_x or 1), (Pauli.Y, w_y or 1), (Pauli.Z, w_z or 1))
+        edge_flip = Fault.edge_flip
+        # Every (edge, flip) pair yields a distinct fault, so the model can be built in one pass without merging
+        atomic_faults: dict[Fault, list[int]] = {
+            edge_flip(edge_idx, flip): [w]
+            for edge_idx in diagram.edge_indices()
+            if edge_idx not in idealised
+            for flip, w in flips
+        }
 
         return NoiseModel(diagram=diagram, atomic_faults=atomic_faults)
 
@@ -99,11 +210,22 @@ class NoiseModel[T]:
             for value in values:
                 yield fault, value
 
-    def compress(self, reweight_func: Callable[[T, T], T]) -> None:
+    def compress(self, reweight_func: Callable[[T, T], T] | Reducer) -> None:
+        match reweight_func:
+            case Reducer.SUM:
+                # Not the builtin sum, which compensates float rounding and thus deviates from folding with addition
+                reduce_values: Callable[[list[T]], T] = partial(reduce, operator.add)
+            case Reducer.MAX:
+                reduce_values = max
+            case Reducer.PROB_OR:
+                reduce_values = _reduce_prob_or
+            case _:
+
+                def reduce_values(values: list[T]) -> T:
+                    return reduce(reweight_func, values)
+
         for fault, values in self._atomic_faults.items():
-            if len(values) == 0 or fault.is_trivial():
+            if len(values) <= 1 or fault.is_trivial():
                 continue
 
-            compressed = reduce(reweight_func, values)
-            values.clear()
-            values.append(compressed)
+            values[:] = [reduce_values(values)]
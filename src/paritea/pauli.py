@@ -1,8 +1,10 @@
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Mapping, Set
 from enum import StrEnum
 
 import frozendict as fd
-from galois import GF2
+import numpy as np
+
+from .util import bit_indices
 
 
 class Pauli(StrEnum):
@@ -14,20 +16,7 @@ class Pauli(StrEnum):
     Y = "Y"
 
     def __mul__(self, other: "Pauli") -> "Pauli":
-        if self == Pauli.I:
-            return other
-        elif other == Pauli.I:
-            return self
-        elif self == other:
-            return Pauli.I
-        elif self != Pauli.X and other != Pauli.X:
-            return Pauli.X
-        elif self != Pauli.Y and other != Pauli.Y:
-            return Pauli.Y
-        elif self != Pauli.Z and other != Pauli.Z:
-            return Pauli.Z
-        else:
-            raise AssertionError("Should never be reached!")
+        return _PAULI_PRODUCTS[self, other]
 
     def __repr__(self):
         return f"Pauli{self.name}"
@@ -44,15 +33,64 @@ class Pauli(StrEnum):
         return self == Pauli.I or other == Pauli.I or self == other
 
 
+def _pauli_product(a: Pauli, b: Pauli) -> Pauli:
+    if a == Pauli.I:
+        return b
+    elif b == Pauli.I:
+        return a
+    elif a == b:
+        return Pauli.I
+    else:
+        # The product of two distinct non-trivial Paulis is the remaining one
+        return next(p for p in Pauli if p not in (Pauli.I, a, b))
+
+
+# All 16 products are tabulated once, so that multiplication is a single lookup instead of a chain of comparisons
+_PAULI_PRODUCTS: dict[tuple[Pauli, Pauli], Pauli] = {(a, b): _pauli_product(a, b) for a in Pauli for b in Pauli}
+
+
+# Up to this many entries, products and commutation are evaluated on the mappings rather than the symplectic forms
+_SPARSE_COMMUTE_THRESHOLD = 8
+
+
 class PauliString(fd.frozendict[int, Pauli]):
     """
     A Pauli string representation as a mapping from edge indices to Pauli rotations.
     Identity rotations are not stored in the resulting string.
+
+    Alongside the mapping, a string has a symplectic form of two bitmasks over edge indices (see .symplectic), which is
+    computed on demand and cached for products and commutation checks.
     """
 
+    _symplectic: tuple[int, int] | None = None
+
+    @staticmethod
+    def _from_trusted(paulis: dict[int, Pauli]) -> "PauliString":
+        """Wraps a mapping that is known to contain no identities, skipping the filtering done by the constructor."""
+        return fd.frozendict.__new__(PauliString, paulis)
+
+    @staticmethod
+    def from_symplectic(x: int, z: int) -> "PauliString":
+        """
+        Builds a Pauli string from its symplectic form, where bit i of x (z) is set iff edge i is flipped by X or Y
+        (Z or Y).
+        """
+        x_bits, z_bits = bin(x)[:1:-1], bin(z)[:1:-1]
+        paulis: dict[int, Pauli] = {}
+        for idx in bit_indices(x | z):
+            has_x = idx < len(x_bits) and x_bits[idx] == "1"
+            has_z = idx < len(z_bits) and z_bits[idx] == "1"
+            paulis[idx] = Pauli.Y if has_x and has_z else Pauli.X if has_x else Pauli.Z
+
+        string = PauliString._from_trusted(paulis)
+        object.__setattr__(string, "_symplectic", (x, z))
+        return string
+
     @staticmethod
     def unary(edge: int, pauli: Pauli) -> "PauliString":
-        return PauliString({edge: pauli})
+        if pauli == Pauli.I:
+            return PauliString()
+        return PauliString._from_trusted({edge: pauli})
 
     def __new__(cls, o: dict | str | None = None):
         if o is None:
@@ -65,30 +103,104 @@ class PauliString(fd.frozendict[int, Pauli]):
             raise ValueError("Unknown source type for PauliString.")
 
     def __mul__(self, other: "PauliString") -> "PauliString":
-        product = {e: self.get(e, other.get(e)) for e in self.keys() ^ other.keys()}
-        for k in self.keys() & other.keys():
-            result = self[k] * other[k]
-            if result != Pauli.I:
-                product[k] = result
-
-        return PauliString(product)
+        if len(self) + len(other) > _SPARSE_COMMUTE_THRESHOLD and None not in (self._symplectic, other._symplectic):
+            # Both bitmasks are at hand, so the product is a single XOR each
+            self_x, self_z = self._symplectic
+            other_x, other_z = other._symplectic
+            return PauliString.from_symplectic(self_x ^ other_x, self_z ^ other_z)
+
+        # Building the bitmasks costs O(max edge index), so merge the mappings entry by entry otherwise
+        product = dict(self)
+        for idx, pauli in other.items():
+            if idx not in product:
+                product[idx] = pauli
+            elif (result := product[idx] * pauli) == Pauli.I:
+                del product[idx]
+            else:
+                product[idx] = result
+
+        return PauliString._from_trusted(product)
+
+    def symplectic(self) -> tuple[int, int]:
+        """
+        :return: The X and Z part of this string as bitmasks over edge indices, such that a Y sets both bits.
+        """
+        if self._symplectic is None:
+            if len(self) == 0:
+                object.__setattr__(self, "_symplectic", (0, 0))
+                return self._symplectic
+
+            # Assemble the bitmasks as binary digit strings, which avoids creating a big integer per set bit
+            x_bits = bytearray(b"0") * (max(self.keys()) + 1)
+            z_bits = x_bits.copy()
+            for idx, pauli in self.items():
+                if pauli != Pauli.Z:
+                    x_bits[idx] = ord("1")
+                if pauli != Pauli.X:
+                    z_bits[idx] = ord("1")
+            object.__setattr__(self, "_symplectic", (int(x_bits[::-1], 2), int(z_bits[::-1], 2)))
+
+        return self._symplectic
 
     def restrict(self, indices: Iterable[int]) -> "PauliString":
-        return PauliString({idx: self[idx] for idx in set(indices).intersection(self.keys())})
+        if not isinstance(indices, Set):
+            indices = set(indices)
+        return PauliString._from_trusted({idx: p for idx, p in self.items() if idx in indices})
 
     def commutes(self, other: "PauliString") -> bool:
-        return sum(not self[k].commutes(other[k]) for k in self.keys() & other.keys()) % 2 == 0
+        smaller, larger = (self, other) if len(self) <= len(other) else (other, self)
+        if len(smaller) <= _SPARSE_COMMUTE_THRESHOLD:
+            # Building the bitmasks costs O(max edge index), so check very sparse strings entry by entry instead
+            anticommuting = 0
+            for idx, pauli in smaller.items():
+                if idx in larger and not pauli.commutes(larger[idx]):
+                    anticommuting += 1
+            return anticommuting % 2 == 0
+
+        self_x, self_z = self.symplectic()
+        other_x, other_z = other.symplectic()
+        # The symplectic product counts the edges on which the two strings anticommute
+        return ((self_x & other_z) ^ (self_z & other_x)).bit_count() % 2 == 0
 
     def is_trivial(self) -> bool:
-        return all(self[p] == Pauli.I for p in self)
+        # Identities are never stored
+        return len(self) == 0
+
+    def compile(self, idx_map: Mapping[int, int]) -> np.ndarray:
+        """
+        :return: The string as a uint8 bit vector of its Z part followed by its X part, in the order of idx_map. Wrap
+            the result in GF2 where it takes part in linear algebra.
+        """
+        num_indices = len(idx_map)
+        set_bits = [idx_map[idx] for idx, pauli in self.items() if pauli != Pauli.X]
+        set_bits.extend(idx_map[idx] + num_indices for idx, pauli in self.items() if pauli != Pauli.Z)
+
+        compiled = np.zeros(num_indices * 2, dtype=np.uint8)
+        compiled[set_bits] = 1
 
-    def compile(self, idx_map: Mapping[int, int]) -> GF2:
+        return compiled
+
+    @staticmethod
+    def compile_all(strings: Iterable["PauliString"], idx_map: Mapping[int, int]) -> np.ndarray:
+        """
+        Compiles several strings into the rows of a single matrix, with the same layout as :meth:`compile`. All set bits
+        are gathered first and written with a single indexed assignment.
+        """
         num_indices = len(idx_map)
-        compiled = GF2.Zeros(num_indices * 2)
-        for idx, pauli in self.items():
-            if pauli == Pauli.Z or pauli == Pauli.Y:
-                compiled[idx_map[idx]] = 1
-            if pauli == Pauli.X or pauli == Pauli.Y:
-                compiled[idx_map[idx] + num_indices] = 1
+        rows: list[int] = []
+        cols: list[int] = []
+        num_strings = 0
+        for row, string in enumerate(strings):
+            num_strings += 1
+            for idx, pauli in string.items():
+                if pauli != Pauli.X:
+                    rows.append(row)
+                    cols.append(idx_map[idx])
+                if pauli != Pauli.Z:
+                    rows.append(row)
+                    cols.append(idx_map[idx] + num_indices)
+
+        compiled = np.zeros((num_strings, num_indices * 2), dtype=np.uint8)
+        compiled[rows, cols] = 1
 
         return compiled
@@ -1,26 +1,64 @@
 from collections import defaultdict
 
-from paritea import PauliString
+from paritea import Pauli, PauliString
 from paritea.flip_operators import FlipOperators
 from paritea.noise import Fault, NoiseModel
+from paritea.util import bit_indices
+
+
+def _anticommutation_masks(generators: list[PauliString]) -> dict[tuple[int, Pauli], int]:
+    """
+    Transposes the given generators into a lookup by edge flip. For each edge and non-trivial Pauli flip on it, the
+    returned bitmask over generator indices marks the generators that anticommute with that flip.
+    """
+    masks: dict[tuple[int, Pauli], int] = defaultdict(int)
+    for i, generator in enumerate(generators):
+        for edge, pauli in generator.items():
+            for flip in (Pauli.X, Pauli.Y, Pauli.Z):
+                if not pauli.commutes(flip):
+                    masks[edge, flip] |= 1 << i
+
+    return dict(masks)
+
+
+def _anticommuting(edge_flips: PauliString, masks: dict[tuple[int, Pauli], int]) -> int:
+    """:return: A bitmask over the generators of the given masks which anticommute with the given edge flips."""
+    anticommuting = 0
+    for edge_flip in edge_flips.items():
+        anticommuting ^= masks.get(edge_flip, 0)
+
+    return anticommuting
 
 
 def push_out[T](model: NoiseModel[T], flip_ops: FlipOperators) -> NoiseModel[T]:
     if model.diagram is not flip_ops.diagram:
         raise AssertionError("The given noise model and flip operators must be for the same diagram!")
 
-    new_faults: dict[Fault, list[T]] = defaultdict(list)
+    # Evaluate all commutation checks of a fault at once through the edges it flips, instead of once per generator.
+    # Stabilisers and regions share one lookup: the low bits of a mask are stabilisers, the high bits regions.
+    num_stabs = len(flip_ops.stab_gen_set)
+    stab_bits = (1 << num_stabs) - 1
+    masks = _anticommutation_masks(list(flip_ops.stab_gen_set) + list(flip_ops.region_gen_set))
+    stab_flip_ops = [flip_op.symplectic() for flip_op in flip_ops.stab_flip_ops]
+
+    # Accumulate values by the new faults' integer forms, which hash far cheaper than the faults themselves. Each
+    # distinct fault is then only built once.
+    new_values: dict[tuple[int, int, int], list[T]] = defaultdict(list)
     for fault, values in model.atomic_faults_with_values():
-        flipped_regions = {
-            i for i in range(len(flip_ops.region_gen_set)) if not fault.edge_flips.commutes(flip_ops.region_gen_set[i])
-        }
+        anticommuting = _anticommuting(fault.edge_flips, masks)
+        detector_bits = fault.detector_bits() | (anticommuting >> num_stabs)
+
+        new_x, new_z = 0, 0
+        for i in bit_indices(anticommuting & stab_bits):
+            flip_x, flip_z = stab_flip_ops[i]
+            new_x ^= flip_x
+            new_z ^= flip_z
 
-        new_fault_edge_flips = PauliString()
-        for stabiliser, flip_op in zip(flip_ops.stab_gen_set, flip_ops.stab_flip_ops):
-            if not fault.edge_flips.commutes(stabiliser):
-                new_fault_edge_flips *= flip_op
+        new_values[new_x, new_z, detector_bits].extend(values)
 
-        new_fault = Fault(new_fault_edge_flips, fault.detector_flips.union(flipped_regions))
-        new_faults[new_fault].extend(values)
+    new_faults: dict[Fault, list[T]] = {
+        Fault(PauliString.from_symplectic(x, z), frozenset(bit_indices(detector_bits))): values
+        for (x, z, detector_bits), values in new_values.items()
+    }
 
     return NoiseModel(model.diagram, new_faults)
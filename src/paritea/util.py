@@ -1,4 +1,5 @@
-from collections.abc import Callable
+import inspect
+from collections.abc import Callable, Iterable, Iterator
 from functools import wraps
 from typing import ParamSpec, TypeVar
 
@@ -8,11 +9,12 @@ P = ParamSpec("P")
 
 def canonicalize_input(**arg_converters):
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        # Introspecting the signature is slow, so only do so once per decorated function
+        signature = inspect.signature(func)
+
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            import inspect
-
-            bound = inspect.signature(func).bind(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
             bound.apply_defaults()
             for arg, converter in arg_converters.items():
                 if arg in bound.arguments:
@@ -22,3 +24,28 @@ def canonicalize_input(**arg_converters):
         return wrapper
 
     return decorator
+
+
+def bit_indices(bits: int) -> Iterator[int]:
+    """Yields the indices of all set bits of a non-negative integer in ascending order."""
+    # Scan the binary representation in reverse, which avoids a big integer operation per bit
+    little_endian = bin(bits)[:1:-1]
+    idx = little_endian.find("1")
+    while idx != -1:
+        yield idx
+        idx = little_endian.find("1", idx + 1)
+
+
+def gf2_rank(vectors: Iterable[int]) -> int:
+    """:return: The rank over GF(2) of non-negative integers, taken as bit vectors."""
+    # Reduce every vector by the basis vectors found so far, each identified by its leading bit
+    basis: dict[int, int] = {}
+    for v in vectors:
+        while v > 0:
+            leading = v.bit_length() - 1
+            if leading not in basis:
+                basis[leading] = v
+                break
+            v ^= basis[leading]
+
+    return len(basis)
@@ -1,3 +1,5 @@
+from functools import singledispatch
+
 import pyzx as zx
 
 from paritea.diagram import Diagram
@@ -6,10 +8,18 @@ from paritea.glue.pyzx import from_pyzx
 type DiagramParam = Diagram | zx.graph.base.BaseGraph
 
 
+# Dispatching on the type avoids an isinstance check against the runtime-checkable Diagram protocol, which inspects
+# all of its members for non-diagrams
+@singledispatch
 def to_diagram(obj: DiagramParam) -> Diagram:
-    if isinstance(obj, Diagram):
-        return obj
-    elif isinstance(obj, zx.graph.base.BaseGraph):
-        return from_pyzx(obj)
-    else:
-        raise TypeError(f"Cannot automatically convert type {type(obj)} to {Diagram.__name__}")
+    raise TypeError(f"Cannot automatically convert type {type(obj)} to {Diagram.__name__}")
+
+
+@to_diagram.register
+def _(obj: Diagram) -> Diagram:
+    return obj
+
+
+@to_diagram.register
+def _(obj: zx.graph.base.BaseGraph) -> Diagram:
+    return from_pyzx(obj)
@@ -1,3 +1,5 @@
+from functools import cache
+
 from paritea.noise import NoiseModel
 from paritea.util import canonicalize_input
 from paritea.utils import DiagramParam, to_diagram
@@ -12,5 +14,10 @@ def to_noise_model[T](obj: NoiseModelParam[T]) -> NoiseModel[T]:
         return NoiseModel.weighted_edge_flip_noise(to_diagram(obj))
 
 
-def noise_model_params(*param_names: str):
+@cache
+def _noise_model_params(param_names: tuple[str, ...]):
     return canonicalize_input(**dict.fromkeys(param_names, to_noise_model))
+
+
+def noise_model_params(*param_names: str):
+    return _noise_model_params(param_names)
@@ -0,0 +1,133 @@
+"""
+Linear algebra over GF(2) on bit-packed matrices.
+
+Each row of a matrix with ``num_cols`` columns is packed into ``ceil(num_cols / 64)`` little-endian uint64 words, such
+that column ``c`` is bit ``c % 64`` of word ``c // 64``. Row operations then XOR 64 entries at once, and eliminating a
+column touches all affected rows in a single NumPy operation.
+"""
+
+import numpy as np
+
+_WORD_BITS = 64
+
+
+def num_words(num_cols: int) -> int:
+    return (num_cols + _WORD_BITS - 1) // _WORD_BITS
+
+
+def pack_rows(bits: np.ndarray) -> np.ndarray:
+    """:return: The packed form of a 2D array of zeros and ones."""
+    num_rows, num_cols = bits.shape
+    packed = np.packbits(np.asarray(bits, dtype=np.uint8), axis=1, bitorder="little")
+    padded = np.zeros((num_rows, num_words(num_cols) * 8), dtype=np.uint8)
+    padded[:, : packed.shape[1]] = packed
+    return padded.view("<u8")
+
+
+def unpack_rows(packed: np.ndarray, num_cols: int) -> np.ndarray:
+    """
+    :return: The uint8 array of zeros and ones with ``num_cols`` columns of which ``packed`` is the packed form. Only
+        the words holding these columns are read, so leading columns of a wider matrix are unpacked cheaply.
+    """
+    as_bytes = np.ascontiguousarray(packed[:, : num_words(num_cols)], dtype="<u8").view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, count=num_cols, bitorder="little")
+
+
+def _column(packed: np.ndarray, col: int) -> np.ndarray:
+    return (packed[:, col // _WORD_BITS] >> np.uint64(col % _WORD_BITS)) & np.uint64(1)
+
+
+def _eliminate(packed: np.ndarray, num_cols: int, *, reduce_above: bool) -> tuple[np.ndarray, list[int]]:
+    reduced = np.array(packed, dtype="<u8", copy=True)
+    num_rows = len(reduced)
+    pivot_cols: list[int] = []
+    for col in range(num_cols):
+        rank = len(pivot_cols)
+        if rank == num_rows:
+            break
+
+        # Extract the column once and derive both the pivot and the rows to clear from it
+        hits = np.flatnonzero(_column(reduced, col))
+        below = hits[hits >= rank]
+        if len(below) == 0:
+            continue
+        pivot = below[0]
+        pivot_row = reduced[pivot].copy()
+
+        # Clear the column in all other rows at once, then move the pivot row into place
+        to_clear = hits if reduce_above else below
+        reduced[to_clear[to_clear != pivot]] ^= pivot_row
+        if pivot != rank:
+            reduced[pivot] = reduced[rank]
+            reduced[rank] = pivot_row
+        pivot_cols.append(col)
+
+    return reduced, pivot_cols
+
+
+def rref_u64(packed: np.ndarray, num_cols: int) -> tuple[np.ndarray, list[int]]:
+    """
+    Computes the reduced row echelon form of a packed matrix.
+
+    :return: The packed reduced matrix, whose all-zero rows are removed, and the pivot column of each remaining row
+    """
+    reduced, pivot_cols = _eliminate(packed, num_cols, reduce_above=True)
+    return reduced[: len(pivot_cols)], pivot_cols
+
+
+def rref_transform_u64(packed: np.ndarray, num_cols: int) -> tuple[np.ndarray, int]:
+    """
+    Computes the row operations that bring a packed matrix ``A`` into reduced row echelon form.
+
+    :return: An invertible unpacked 0/1 matrix ``T`` such that ``T A`` is the reduced row echelon form of ``A``, with
+        all-zero rows at the bottom, and the rank of ``A``. The rows of ``T`` from the rank onwards thus form a basis of
+        the left null space of ``A``.
+    """
+    # Eliminate on the matrix with an identity appended, pivoting on the columns of A only
+    num_rows, words = packed.shape
+    identity = pack_rows(np.eye(num_rows, dtype=np.uint8))
+    reduced, pivot_cols = _eliminate(np.hstack([packed, identity]), num_cols, reduce_above=True)
+    return unpack_rows(np.ascontiguousarray(reduced[:, words:]), num_rows), len(pivot_cols)
+
+
+def pivot_columns_u64(packed: np.ndarray, num_cols: int) -> list[int]:
+    """
+    :return: The pivot columns of a packed matrix, as in :func:`rref_u64`. Only forward elimination is performed, which
+        suffices to determine the pivots.
+    """
+    return _eliminate(packed, num_cols, reduce_above=False)[1]
+
+
+def null_space_u64(packed: np.ndarray, num_cols: int) -> np.ndarray:
+    """
+    :return: A packed basis for the (right) null space of a packed matrix, i.e. all vectors ``x`` with ``A x = 0``, with
+        one basis vector per non-pivot column
+    """
+    return null_space_from_rref_u64(*rref_u64(packed, num_cols), num_cols)
+
+
+def null_space_from_rref_u64(reduced: np.ndarray, pivot_cols: list[int], num_cols: int) -> np.ndarray:
+    """Same as :func:`null_space_u64`, but for a matrix that already is in the form returned by :func:`rref_u64`."""
+    free_cols = sorted(set(range(num_cols)).difference(pivot_cols))
+
+    # For free column f, the basis vector sets f and every pivot column whose row has column f set
+    reduced_bits = unpack_rows(reduced, num_cols)
+    basis = np.zeros((len(free_cols), num_cols), dtype=np.uint8)
+    basis[np.arange(len(free_cols)), free_cols] = 1
+    basis[:, pivot_cols] = reduced_bits[:, free_cols].T
+
+    return pack_rows(basis)
+
+
+def combine_rows_u64(selection: np.ndarray, packed: np.ndarray) -> np.ndarray:
+    """:return: The packed product of an (unpacked) 0/1 selection matrix with a packed matrix over GF(2)."""
+    combined = np.zeros((len(selection), packed.shape[1]), dtype="<u8")
+    rows, selected = np.nonzero(selection)
+    if len(rows) == 0:
+        return combined
+
+    # Gather all selected rows at once, then XOR each output row's contiguous run of them in a single reduction
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    combined[rows[starts]] = np.bitwise_xor.reduceat(packed[selected], starts, axis=0)
+
+    return combined
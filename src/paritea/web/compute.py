@@ -1,12 +1,21 @@
-from copy import deepcopy
-
 import numpy as np
+from pyzx.graph.base import upair
 
 from paritea.diagram import Diagram
 from paritea.pauli import Pauli, PauliString
 
+from ._gf2 import (
+    combine_rows_u64,
+    null_space_from_rref_u64,
+    null_space_u64,
+    pack_rows,
+    pivot_columns_u64,
+    rref_u64,
+    unpack_rows,
+)
 from .firing_assignments import (
-    convert_firing_assignment_to_web_prototype,
+    build_firing_incidence,
+    convert_firing_assignments_to_web_prototypes,
     create_firing_verification,
     determine_ordering,
 )
@@ -14,58 +23,77 @@ from .red_green import to_red_green_form
 
 
 def _compute(
-    diagram: Diagram, *, stabilisers: bool, detecting_regions: bool
+    diagram: Diagram, *, stabilisers: bool, detecting_regions: bool, in_place: bool = False
 ) -> tuple[list[PauliString] | None, list[PauliString] | None]:
     """
     Performs full stabiliser and detecting region computation, depending on the given flags. Enabling both flags in one
     call is preferred to enabling them in separate calls as they may share basic computations.
+
+    :param in_place: Whether the diagram may be modified instead of copied, for diagrams that are not used afterwards
     """
 
     if diagram.is_io_virtual():
         raise ValueError("This function does not accept diagrams with virtual IO!")
 
+    # Resolve edges by their endpoints once for all webs, keeping the first of any parallel edges
+    edge_indices: dict[tuple[int, int], int] = {}
+    for idx, (s, t) in zip(diagram.edge_indices(), diagram.edge_list()):
+        edge_indices.setdefault(upair(s, t), idx)
+
     def to_pauli_string(prototype: dict[tuple[int, int], Pauli]) -> PauliString:
-        return PauliString({diagram.edge_indices_from_endpoints(*edge)[0]: p for edge, p in prototype.items()})
+        return PauliString({edge_indices[edge]: p for edge, p in prototype.items()})
 
-    d = deepcopy(diagram)
+    def to_pauli_strings(prototypes: list[dict[tuple[int, int], Pauli]]) -> list[PauliString]:
+        # Map each prototype back onto the original diagram and convert it right away, so it is only traversed once
+        webs = []
+        for prototype in prototypes:
+            remove_additional_nodes(prototype)
+            webs.append(to_pauli_string(prototype))
+        return webs
+
+    d = diagram if in_place else diagram.clone()
 
     additional_nodes = to_red_green_form(d)
+    remove_additional_nodes = additional_nodes.web_rewriter(d)
     ordering = determine_ordering(d)
     m_d = create_firing_verification(d, ordering)
+    incidence = build_firing_incidence(d, ordering)
 
     # Compute row span of valid firing assignment space
-    sol_row_basis = m_d.null_space()
+    num_cols = m_d.shape[1]
+    sol_row_basis = null_space_u64(pack_rows(m_d.view(np.ndarray)), num_cols)
+    if len(ordering.z_boundaries) == 0:
+        # Without boundary edges, no solution is stabilising and every solution is a detecting region
+        regions = None
+        if detecting_regions:
+            region_sols = unpack_rows(sol_row_basis, num_cols)
+            regions = to_pauli_strings(convert_firing_assignments_to_web_prototypes(incidence, region_sols))
+        return [] if stabilisers else None, regions
+
+    # The first 2k entries of a firing assignment determine the boundary edges highlighted by its web
+    boundary_selected_basis = unpack_rows(sol_row_basis, len(ordering.z_boundaries) * 2).T
+    # A single reduction serves both branches: its pivot columns select stabilisers, its free columns span the regions.
+    # The pivots alone do not require a fully reduced matrix though.
+    packed_boundary_basis = pack_rows(boundary_selected_basis)
+    if detecting_regions:
+        boundary_rref, pivot_cols = rref_u64(packed_boundary_basis, len(sol_row_basis))
+    else:
+        pivot_cols = pivot_columns_u64(packed_boundary_basis, len(sol_row_basis))
 
     stabs = None
     if stabilisers:
-        # Search for solutions that do not highlight boundary edges, i.e. detecting regions
-        boundary_selected_basis = sol_row_basis.transpose()[: len(ordering.z_boundaries) * 2, :]
-
-        pivot_cols = []
-        for row in boundary_selected_basis.row_reduce():
-            nonzero_indices = np.nonzero(row)[0]
-            if len(nonzero_indices) > 0:
-                pivot_cols.append(nonzero_indices[0])
-        stab_sols = [sol_row_basis[i].tolist() for i in pivot_cols]
-        web_prototypes = [convert_firing_assignment_to_web_prototype(d, ordering, v) for v in stab_sols]
-        for web_prototype in web_prototypes:
-            additional_nodes.remove_from(d, web_prototype)
-        stabs = list(map(to_pauli_string, web_prototypes))
+        # Select one solution per independent combination of highlighted boundary edges
+        stab_sols = unpack_rows(sol_row_basis[pivot_cols], num_cols)
+        stabs = to_pauli_strings(convert_firing_assignments_to_web_prototypes(incidence, stab_sols))
 
     regions = None
     if detecting_regions:
         # Search for solutions that do not highlight boundary edges, i.e. detecting regions
-        boundary_selected_basis = sol_row_basis.transpose()[: len(ordering.z_boundaries) * 2, :]
-        boundary_nullspace_vectors = boundary_selected_basis.null_space()
-        # Empty nullspace of boundary edges -> no webs that highlight no boundary edges -> no detecting regions
-        if len(boundary_nullspace_vectors) == 0:
-            region_sols = []
-        else:
-            region_sols = (boundary_nullspace_vectors @ sol_row_basis).tolist()
-        web_prototypes = [convert_firing_assignment_to_web_prototype(d, ordering, v) for v in region_sols]
-        for web_prototype in web_prototypes:
-            additional_nodes.remove_from(d, web_prototype)
-        regions = list(map(to_pauli_string, web_prototypes))
+        boundary_nullspace_vectors = unpack_rows(
+            null_space_from_rref_u64(boundary_rref, pivot_cols, len(sol_row_basis)), len(sol_row_basis)
+        )
+        region_sols = unpack_rows(combine_rows_u64(boundary_nullspace_vectors, sol_row_basis), num_cols)
+        regions = to_pauli_strings(convert_firing_assignments_to_web_prototypes(incidence, region_sols))
 
     return stabs, regions
 
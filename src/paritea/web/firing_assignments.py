@@ -1,13 +1,14 @@
-from collections import defaultdict
 from typing import NamedTuple
 
+import numpy as np
 from galois import GF2
 from pyzx.graph.base import upair
-from pyzx.linalg import Z2
 
 from paritea.diagram import Diagram, NodeType
 from paritea.pauli import Pauli
 
+from ._gf2 import combine_rows_u64, pack_rows, unpack_rows
+
 
 class GraphOrdering(NamedTuple):
     graph_to_ordering: dict[int, int]
@@ -52,47 +53,96 @@ def determine_ordering(d: Diagram) -> GraphOrdering:
 def create_firing_verification(d: Diagram, ordering: GraphOrdering) -> GF2:
     num_z_boundaries = len(ordering.z_boundaries)
     num_non_boundary_spiders = num_z_boundaries + len(ordering.internal_spiders)
-    adj_matrix = GF2.Zeros((num_non_boundary_spiders, num_non_boundary_spiders))
-
-    for s, t in d.edge_list():
-        if d.type(s) != NodeType.B and d.type(t) != NodeType.B:
-            adj_matrix[ordering.ord(s), ordering.ord(t)] = 1
-            adj_matrix[ordering.ord(t), ordering.ord(s)] = 1
+    ords = ordering.graph_to_ordering
+    spider_edges = np.array(
+        [(ords[s], ords[t]) for s, t in d.edge_list() if d.type(s) != NodeType.B and d.type(t) != NodeType.B],
+        dtype=np.intp,
+    ).reshape(-1, 2)
 
     rows, cols = num_non_boundary_spiders, num_non_boundary_spiders + num_z_boundaries
-    m_d = GF2.Zeros((rows, cols))
+    m_d = np.zeros((rows, cols), dtype=np.uint8)
+
+    boundary_range = np.arange(num_z_boundaries)
+    m_d[boundary_range, boundary_range] = 1
 
-    m_d[0:num_z_boundaries, 0:num_z_boundaries] = GF2.Identity(num_z_boundaries)
+    # The adjacency matrix of the spiders, written in a single indexed assignment per direction
+    m_d[spider_edges[:, 0], spider_edges[:, 1] + num_z_boundaries] = 1
+    m_d[spider_edges[:, 1], spider_edges[:, 0] + num_z_boundaries] = 1
 
-    m_d[:, num_z_boundaries:] = adj_matrix
+    # Flip the diagonal of the bottom right block of pi/2 spiders
+    pi_2_range = np.arange(len(ordering.pi_2_spiders))
+    m_d[rows - len(pi_2_range) + pi_2_range, cols - len(pi_2_range) + pi_2_range] ^= 1
 
-    num_pi_2 = len(ordering.pi_2_spiders)
-    slice_key = (slice(rows - num_pi_2, rows), slice(cols - num_pi_2, cols))
-    m_d[slice_key] = m_d[slice_key].view(dtype=bool) ^ GF2.Identity(num_pi_2).view(dtype=bool)
+    return m_d.view(GF2)
 
-    return m_d
 
+class FiringIncidence(NamedTuple):
+    """
+    The edges highlighted by firing each entry of a firing assignment, as packed GF(2) matrices (see ._gf2) with one
+    row per firing assignment entry and one column per edge.
+    """
 
-def convert_firing_assignment_to_web_prototype(
-    d: Diagram, ordering: GraphOrdering, v: list[Z2]
-) -> dict[tuple[int, int], Pauli]:
-    prot: dict[tuple[int, int], Pauli] = defaultdict(lambda: Pauli.I)
+    edges: list[tuple[int, int]]
+    x_incidence: np.ndarray
+    z_incidence: np.ndarray
 
+
+def build_firing_incidence(d: Diagram, ordering: GraphOrdering) -> FiringIncidence:
+    num_z_boundaries = len(ordering.z_boundaries)
+    num_entries = num_z_boundaries + len(ordering.ordering_to_graph)
+
+    # Look up the firing entry and colour of every spider once, rather than per neighbour
+    x_firing_rows: dict[int, int] = {}  # Green spiders, whose firing highlights their edges red
+    z_firing_rows: dict[int, int] = {}  # Red spiders, whose firing highlights their edges green
     for adj_vertex, g_vertex in ordering.ordering_to_graph.items():
         g_type = d.type(g_vertex)
-        # Fire all green spiders with full red edges and thus their red neighbours
-        if g_type == NodeType.Z and v[adj_vertex + len(ordering.z_boundaries)] == 1:
-            for _n in d.neighbors(g_vertex):
-                prot[upair(g_vertex, _n)] *= Pauli.X
-        # Fire all red spiders with full green edges and thus their green neighbours
-        if g_type == NodeType.X and v[adj_vertex + len(ordering.z_boundaries)] == 1:
-            for _n in d.neighbors(g_vertex):
-                prot[upair(g_vertex, _n)] *= Pauli.Z
-
-    # Fire all green output edges
+        if g_type == NodeType.Z:
+            x_firing_rows[g_vertex] = adj_vertex + num_z_boundaries
+        elif g_type == NodeType.X:
+            z_firing_rows[g_vertex] = adj_vertex + num_z_boundaries
+
+    # Parallel edges share one column, as webs are keyed by endpoints
+    edge_columns: dict[tuple[int, int], int] = {}
+    for s, t in d.edge_list():
+        edge_columns.setdefault(upair(s, t), len(edge_columns))
+
+    x_incidence = np.zeros((num_entries, len(edge_columns)), dtype=np.uint8)
+    z_incidence = np.zeros((num_entries, len(edge_columns)), dtype=np.uint8)
+    for edge, col in edge_columns.items():
+        for g_vertex in edge:
+            if g_vertex in x_firing_rows:
+                x_incidence[x_firing_rows[g_vertex], col] = 1
+            elif g_vertex in z_firing_rows:
+                z_incidence[z_firing_rows[g_vertex], col] = 1
+
+    # Firing a green output edge highlights it green
     for g_z_boundary, g_boundary in ordering.z_boundaries.items():
-        adj_z_boundary = ordering.ord(g_z_boundary)
-        if v[adj_z_boundary] == 1:
-            prot[upair(g_z_boundary, g_boundary)] *= Pauli.Z
+        z_incidence[ordering.ord(g_z_boundary), edge_columns[upair(g_z_boundary, g_boundary)]] = 1
+
+    return FiringIncidence(list(edge_columns), pack_rows(x_incidence), pack_rows(z_incidence))
+
+
+# Maps the integer code x | (z << 1) of a highlighted edge to its Pauli
+_bits_to_pauli = (Pauli.I, Pauli.X, Pauli.Z, Pauli.Y)
+
+
+def convert_firing_assignments_to_web_prototypes(
+    incidence: FiringIncidence, assignments: np.ndarray
+) -> list[dict[tuple[int, int], Pauli]]:
+    """
+    Converts all given firing assignments (one per row, as zeros and ones) at once, where the highlighted edges of every
+    assignment are the sum of the incidence rows of its fired entries.
+    """
+    num_edges = len(incidence.edges)
+    x_bits = unpack_rows(combine_rows_u64(assignments, incidence.x_incidence), num_edges)
+    z_bits = unpack_rows(combine_rows_u64(assignments, incidence.z_incidence), num_edges)
+    codes = x_bits | (z_bits << 1)
+
+    # Read all set entries into Python ints at once, so the loop below performs no NumPy scalar accesses
+    webs, cols = np.nonzero(codes)
+    edges = incidence.edges
+    prototypes: list[dict[tuple[int, int], Pauli]] = [{} for _ in range(len(assignments))]
+    for web, col, code in zip(webs.tolist(), cols.tolist(), codes[webs, cols].tolist()):
+        prototypes[web][edges[col]] = _bits_to_pauli[code]
 
-    return prot
+    return prototypes
@@ -1,13 +1,16 @@
 import dataclasses
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import field
-from itertools import starmap
 
 import numpy as np
-from galois import GF2
+from pyzx.graph.base import upair
 
-from paritea import PauliString
+from paritea import Pauli, PauliString
 from paritea.diagram import Diagram, NodeType
-from paritea.web import compute_pauli_webs
+from paritea.web.compute import _compute
+
+from ._gf2 import combine_rows_u64, null_space_u64, num_words, pack_rows, rref_transform_u64, unpack_rows
 
 
 @dataclasses.dataclass(init=True, repr=False)
@@ -15,11 +18,86 @@ class _SubgraphTracker:
     inc_edges: dict[int, "_SubgraphTracker | None"] = field(default_factory=dict)
 
 
-def _find_webs(sg: Diagram, edge_map: dict[int, int]) -> tuple[list[PauliString], list[PauliString]]:
-    st, re = compute_pauli_webs(sg)
-    new_st = [PauliString({edge_map[e]: p for e, p in s.items()}) for s in st]
-    new_re = [PauliString({edge_map[e]: p for e, p in r.items()}) for r in re]
-    return new_st, new_re
+type _EndpointWebs = tuple[list[dict[tuple[int, int], Pauli]], list[dict[tuple[int, int], Pauli]]]
+
+
+def _compute_endpoint_webs(sg: Diagram) -> _EndpointWebs:
+    # Subdiagrams are only extracted to compute their webs, so they are consumed rather than copied
+    endpoints = {e: upair(s, t) for e, (s, t) in zip(sg.edge_indices(), sg.edge_list())}
+    st, re = _compute(sg, stabilisers=True, detecting_regions=True, in_place=True)
+    endpoint_st = [{endpoints[e]: p for e, p in s.items()} for s in st]
+    endpoint_re = [{endpoints[e]: p for e, p in r.items()} for r in re]
+    return endpoint_st, endpoint_re
+
+
+def _cache_key(sg: Diagram) -> tuple | None:
+    return None if sg.has_parallel_edges() else sg.structural_key()
+
+
+def _endpoint_webs(sg: Diagram, memo: dict[tuple, _EndpointWebs]) -> _EndpointWebs:
+    """
+    :return: The Pauli webs of the given subdiagram, keyed by edge endpoints. Repeated subdiagrams, such as the rounds
+        of a repeated extraction, are only computed once per memo. Subdiagrams with parallel edges are not memoised, as
+        their edges are not identified by endpoints. The subdiagram is consumed if its webs are computed.
+    """
+    key = _cache_key(sg)
+    if key is not None and key in memo:
+        return memo[key]
+
+    webs = _compute_endpoint_webs(sg)
+    if key is not None:
+        memo[key] = webs
+
+    return webs
+
+
+def _precompute_webs(subgraphs: list[Diagram], n_jobs: int) -> dict[tuple, _EndpointWebs]:
+    """:return: The webs of all distinct subdiagrams, computed in worker processes, as a memo for _endpoint_webs"""
+    pending: dict[tuple, Diagram] = {}
+    for sg in subgraphs:
+        key = _cache_key(sg)
+        if key is not None:
+            pending.setdefault(key, sg)
+    if len(pending) < 2:
+        return {}
+
+    # Forking a process whose libraries have started threads may deadlock the workers, so they are spawned afresh
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(pending)), mp_context=mp_context) as executor:
+        return dict(zip(pending, executor.map(_compute_endpoint_webs, pending.values())))
+
+
+def _find_webs(
+    sg: Diagram, edge_map: dict[int, int], memo: dict[tuple, _EndpointWebs]
+) -> tuple[list[PauliString], list[PauliString]]:
+    endpoint_map = {upair(s, t): edge_map[se] for se, (s, t) in zip(sg.edge_indices(), sg.edge_list())}
+    endpoint_st, endpoint_re = _endpoint_webs(sg, memo)
+
+    # The webs stem from Pauli strings and thus hold no identities, so the remapped strings need no filtering
+    def remap(web: dict[tuple[int, int], Pauli]) -> PauliString:
+        return PauliString._from_trusted({endpoint_map[e]: p for e, p in web.items()})  # noqa: SLF001
+
+    return [remap(s) for s in endpoint_st], [remap(r) for r in endpoint_re]
+
+
+def _symplectic_words(symplectic: list[tuple[int, int]], min_bits: int) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    :return: The X and Z bitmasks of the given symplectic forms, packed with one row per form as in ._gf2, and the
+        number of columns, i.e. edge indices, they span (at least min_bits)
+    """
+    num_bits = max([min_bits, *(max(x.bit_length(), z.bit_length()) for x, z in symplectic)])
+    num_bytes = num_words(num_bits) * 8
+
+    def to_words(masks: list[int]) -> np.ndarray:
+        as_bytes = b"".join(m.to_bytes(num_bytes, "little") for m in masks)
+        return np.frombuffer(as_bytes, dtype="<u8").reshape(len(masks), num_bytes // 8)
+
+    return to_words([x for x, _ in symplectic]), to_words([z for _, z in symplectic]), num_bits
+
+
+def _to_symplectic(packed: np.ndarray) -> list[int]:
+    """:return: The bitmasks of the rows of a packed matrix as integers"""
+    return [int.from_bytes(row.tobytes(), "little") for row in packed]
 
 
 def _zip_webs(
@@ -28,51 +106,49 @@ def _zip_webs(
     zipped_edges: list[int],
     new_boundaries: list[int],
 ) -> tuple[list[PauliString], list[PauliString]]:
-    # Prepare and compile stabilisers for both subdiagrams
-    zip_idx_map = {e: i for i, e in enumerate(zipped_edges)}
-    boundary_idx_map = {e: i for i, e in enumerate(new_boundaries)}
-    cur_stabs_compiled = [s.restrict(zipped_edges).compile(zip_idx_map) for s in cur_stabs]
-    cur_stabs_boundary_compiled = [s.restrict(new_boundaries).compile(boundary_idx_map) for s in cur_stabs]
-
-    next_stabs_compiled = [s.restrict(zipped_edges).compile(zip_idx_map) for s in next_stabs]
-    next_stabs_boundary_compiled = [s.restrict(new_boundaries).compile(boundary_idx_map) for s in next_stabs]
-
-    if len(cur_stabs_compiled) == 0 and len(next_stabs_compiled) == 0:
+    if len(cur_stabs) == 0 and len(next_stabs) == 0:
         return [], []
 
-    # Compute matchings over shared edges
-    all_compiled = GF2(cur_stabs_compiled + next_stabs_compiled).transpose()
-    solutions = all_compiled.null_space()  # Row-matrix of combination vectors for valid matches
+    # Prepare and compile stabilisers for both subdiagrams from their symplectic forms, selecting the columns of the
+    # zipped and new boundary edges from one bit matrix instead of restricting and compiling each stabiliser twice
+    num_cur = len(cur_stabs)
+    x_words, z_words, num_bits = _symplectic_words(
+        [s.symplectic() for s in [*cur_stabs, *next_stabs]], max([*zipped_edges, *new_boundaries], default=-1) + 1
+    )
+    x_bits, z_bits = unpack_rows(x_words, num_bits), unpack_rows(z_words, num_bits)
+    all_stabs_compiled = np.hstack([z_bits[:, zipped_edges], x_bits[:, zipped_edges]])
+    all_boundary_compiled = np.hstack([z_bits[:, new_boundaries], x_bits[:, new_boundaries]])
+
+    # Compute matchings over shared edges as a row-matrix of combination vectors for valid matches. Stabilisers that do
+    # not touch the zipped edges match on their own, so only the remaining ones take part in the elimination.
+    num_stabs = len(all_stabs_compiled)
+    touching = all_stabs_compiled.any(axis=1)
+    shared, exclusive = np.flatnonzero(touching), np.flatnonzero(~touching)
+    shared_solutions = unpack_rows(null_space_u64(pack_rows(all_stabs_compiled[shared].T), len(shared)), len(shared))
+    solutions = np.zeros((len(shared_solutions) + len(exclusive), num_stabs), dtype=np.uint8)
+    solutions[: len(shared_solutions), shared] = shared_solutions
+    solutions[np.arange(len(shared_solutions), len(solutions)), exclusive] = 1
 
     # Compute a basis change to extract the maximum number of detecting regions possible
-    all_boundary_compiled = GF2(cur_stabs_boundary_compiled + next_stabs_boundary_compiled)
-    boundary_solutions = solutions @ all_boundary_compiled
-    stacked = GF2(np.hstack([boundary_solutions, GF2.Identity(len(boundary_solutions))]))
-    basis_change = stacked.row_reduce()[:, -len(boundary_solutions) :]
-    solutions_basis_changed = basis_change @ solutions
-
-    # Extract webs from matching information
-    new_stabs = []
-    new_regions = []
-    for solution in solutions_basis_changed:
-        converted = solution.tolist()
-        cur_activations = converted[: len(cur_stabs)]
-        next_activations = converted[len(cur_stabs) :]
-
-        next_web: PauliString = PauliString()
-        for idx, activated in enumerate(cur_activations):
-            if activated:
-                next_web *= cur_stabs[idx]
-        shared_edges = next_web.restrict(zipped_edges)
-        for idx, activated in enumerate(next_activations):
-            if activated:
-                next_web *= next_stabs[idx]
-        next_web *= shared_edges
-
-        if next_web.restrict(new_boundaries).is_trivial():
-            new_regions.append(next_web)
-        else:
-            new_stabs.append(next_web)
+    boundary_solutions = combine_rows_u64(solutions, pack_rows(all_boundary_compiled))
+    basis_change, num_new_stabs = rref_transform_u64(boundary_solutions, all_boundary_compiled.shape[1])
+    solutions_basis_changed = unpack_rows(combine_rows_u64(basis_change, pack_rows(solutions)), num_stabs)
+
+    # Extract webs from matching information by combining the activated stabilisers' packed X and Z rows, where a
+    # product is an XOR. Matched stabilisers agree on the zipped edges, where the webs keep the value of either side.
+    zipped_bits = np.zeros((1, num_bits), dtype=np.uint8)
+    zipped_bits[0, zipped_edges] = 1
+    zipped_words = pack_rows(zipped_bits)[0]
+    cur_selection, next_selection = solutions_basis_changed[:, :num_cur], solutions_basis_changed[:, num_cur:]
+
+    def combine(words: np.ndarray) -> list[int]:
+        cur = combine_rows_u64(cur_selection, words[:num_cur])
+        nex = combine_rows_u64(next_selection, words[num_cur:])
+        return _to_symplectic(((cur ^ nex) & ~zipped_words) | (cur & zipped_words))
+
+    # Solutions past the rank of the boundary solutions have been reduced to a trivial boundary, i.e. are regions
+    webs = [PauliString.from_symplectic(x, z) for x, z in zip(combine(x_words), combine(z_words))]
+    new_stabs, new_regions = webs[:num_new_stabs], webs[num_new_stabs:]
 
     if len(new_stabs) != len(new_boundaries):
         raise AssertionError(
@@ -84,13 +160,21 @@ def _zip_webs(
 
 
 def pauli_webs_through_partitions(
-    d: Diagram, *, partitions: list[list[int]]
+    d: Diagram, *, partitions: list[list[int]], n_jobs: int = 1
 ) -> tuple[list[PauliString], list[PauliString]]:
     """
     Computes the Pauli webs of the given diagram with the provided partitions by calculating the Pauli webs of each
     subdiagram individually and combining the results. Provided partitions must cover all nodes except for boundaries.
+
+    :param n_jobs: Number of worker processes to compute the webs of distinct subdiagrams in. Parallelism only pays off
+        for large subdiagrams, so subdiagrams are computed in this process by default. Workers are spawned, i.e. they
+        re-import the calling script, which must therefore guard its entry point with ``if __name__ == "__main__":``
+        when passing ``n_jobs > 1``. Every distinct subdiagram is pickled to a worker and its webs are pickled back.
     """
 
+    if n_jobs < 1:
+        raise ValueError(f"n_jobs must be at least 1, got {n_jobs}!")
+
     if d.is_io_virtual():
         raise ValueError("This function can only process diagrams with real IO!")
 
@@ -101,6 +185,17 @@ def pauli_webs_through_partitions(
     cut_edges: dict[int, _SubgraphTracker] = {}
     subgraphs: list[tuple[Diagram, dict[int, int]]] = []
     sg_trackers: list[_SubgraphTracker] = []
+    tracker_indices: dict[int, int] = {}
+
+    # Resolve edges by their endpoints and collect the incident edges of all nodes in one pass. Each edge lies within at
+    # most one partition, so parallel edges can simply be handed out in index order.
+    endpoint_edges: dict[tuple[int, int], list[int]] = {}
+    incident_edges: dict[int, list[tuple[int, int]]] = {}
+    for e, (s, t) in zip(d.edge_indices(), d.edge_list()):
+        endpoint_edges.setdefault(upair(s, t), []).append(e)
+        incident_edges.setdefault(s, []).append((e, t))
+        incident_edges.setdefault(t, []).append((e, s))
+
     # Extract subgraphs from partitions and build partition neighbour tracking graph
     for part in partitions:
         if not allocated_nodes.isdisjoint(part):
@@ -111,13 +206,14 @@ def pauli_webs_through_partitions(
 
         subgraph, node_map = d.subgraph(part, preserve_data=False)
         tracker = _SubgraphTracker()
+        tracker_indices[id(tracker)] = len(sg_trackers)
         sg_trackers.append(tracker)
 
         io_nodes = []
+        part_nodes = set(part)
         for node in part:
-            for e, adj in d.incident_edge_index_map(node).items():
-                _, other, _ = adj
-                if other in part:
+            for e, other in incident_edges.get(node, ()):
+                if other in part_nodes:
                     continue
 
                 io_nodes.append(node)
@@ -133,35 +229,49 @@ def pauli_webs_through_partitions(
         subgraph.set_io([], [reverse_node_map[n] for n in io_nodes], virtual=True)
 
         edge_map: dict[int, int] = {}
-        for se in subgraph.edge_indices():
-            s, t = subgraph.get_edge_endpoints_by_index(se)
-            edge_map[se] = d.edge_indices_from_endpoints(node_map[s], node_map[t])[0]
+        for se, (s, t) in zip(subgraph.edge_indices(), subgraph.edge_list()):
+            edge_map[se] = endpoint_edges[upair(node_map[s], node_map[t])].pop(0)
         _, real_sub_outputs = subgraph.realize_io()
         for b, d_edge in zip(real_sub_outputs, tracker.inc_edges):
             edge_map[subgraph.incident_edges(b)[0]] = d_edge
         subgraphs.append((subgraph, edge_map))
 
-    unallocated_nodes = [n for n in set(d.node_indices()).difference(allocated_nodes) if d.type(n) != NodeType.B]
+    unallocated_nodes = [n for n in d.node_indices() if n not in allocated_nodes and d.type(n) != NodeType.B]
     if len(unallocated_nodes) > 0:
         raise ValueError(f"Not all nodes were allocated: {unallocated_nodes}")
 
     # Find webs for all subdiagrams
-    webs = list(starmap(_find_webs, subgraphs))
+    memo = _precompute_webs([sg for sg, _ in subgraphs], n_jobs) if n_jobs > 1 else {}
+    webs = [_find_webs(sg, edge_map, memo) for sg, edge_map in subgraphs]
 
-    # Zip all webs together
+    # Zip all webs together. The open edges of the zipped subdiagram are also grouped by the subdiagram across them, so
+    # each step only touches the edges of the absorbed neighbour. Open edges never lead to an absorbed subdiagram, as
+    # all edges between two subdiagrams are zipped at once.
     cur_stabs, cur_regions = webs[0]
-    main_tracker = sg_trackers[0]
-    while any(main_tracker.inc_edges.values()):
-        neighbour = next(n for n in main_tracker.inc_edges.values() if n is not None)
-        edges_to_neighbour = [e for e, t in main_tracker.inc_edges.items() if t is neighbour]
-
-        main_tracker.inc_edges = {e: tr for e, tr in main_tracker.inc_edges.items() if e not in edges_to_neighbour}
-        main_tracker.inc_edges |= {e: tr for e, tr in neighbour.inc_edges.items() if e not in edges_to_neighbour}
-
-        neighbour_stabs, neighbour_regions = webs[sg_trackers.index(neighbour)]
-        nex_stabs, nex_regions = _zip_webs(
-            cur_stabs, neighbour_stabs, edges_to_neighbour, list(main_tracker.inc_edges.keys())
-        )
+    open_edges = dict(sg_trackers[0].inc_edges)
+    edges_by_neighbour: dict[int, list[int]] = {}
+    for e, tr in open_edges.items():
+        if tr is not None:
+            edges_by_neighbour.setdefault(tracker_indices[id(tr)], []).append(e)
+
+    while edges_by_neighbour:
+        # Zip the neighbour across the first open edge that leads to one
+        neighbour_idx = next(iter(edges_by_neighbour))
+        edges_to_neighbour = edges_by_neighbour.pop(neighbour_idx)
+        for e in edges_to_neighbour:
+            del open_edges[e]
+
+        # Take over the neighbour's remaining edges
+        zipped = set(edges_to_neighbour)
+        for e, tr in sg_trackers[neighbour_idx].inc_edges.items():
+            if e in zipped:
+                continue
+            open_edges[e] = tr
+            if tr is not None:
+                edges_by_neighbour.setdefault(tracker_indices[id(tr)], []).append(e)
+
+        neighbour_stabs, neighbour_regions = webs[neighbour_idx]
+        nex_stabs, nex_regions = _zip_webs(cur_stabs, neighbour_stabs, edges_to_neighbour, list(open_edges.keys()))
 
         cur_stabs = nex_stabs
         cur_regions.extend(neighbour_regions)
@@ -1,4 +1,5 @@
-from collections.abc import Iterable
+from collections import Counter
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from fractions import Fraction
 
@@ -22,6 +23,10 @@ class ExpandedHadamard:
     flipped_decomposition: bool
 
 
+# Edges whose Pauli is moved onto another edge if present, followed by the edges that are removed
+type _WebRewrite = tuple[tuple[tuple[tuple[int, int], tuple[int, int]], ...], tuple[tuple[int, int], ...]]
+
+
 class AdditionalNodes:
     extra_id_nodes: list[ExtraIdNode]
     expanded_hadamards: list[ExpandedHadamard]
@@ -40,42 +45,32 @@ class AdditionalNodes:
     def add_expanded_hadamard(self, expanded_hadamard: ExpandedHadamard):
         self.expanded_hadamards.append(expanded_hadamard)
 
-    def _remove_extra_id_node(
-        self, adj: dict[int, dict[int, any]], web: dict[tuple[int, int], Pauli], id_node: ExtraIdNode
-    ):
+    @staticmethod
+    def _extra_id_node_rewrite(adj: dict[int, dict[int, bool]], id_node: ExtraIdNode) -> _WebRewrite:
         v1, v2 = adj[id_node.node].keys()
-        web[upair(v1, v2)] = web.get(upair(v1, id_node.node), Pauli.I)
         adj[v1][v2] = True
         adj[v2][v1] = True
-        web.pop(upair(v1, id_node.node), "")
-        web.pop(upair(id_node.node, v2), "")
         del adj[v1][id_node.node]
         del adj[id_node.node][v1]
         del adj[id_node.node][v2]
         del adj[v2][id_node.node]
 
-    def _remove_expanded_hadamard(
-        self, adj: dict[int, dict[int, any]], web: dict[tuple[int, int], Pauli], hadamard: ExpandedHadamard
-    ):
+        return ((upair(v1, id_node.node), upair(v1, v2)),), (upair(v1, id_node.node), upair(id_node.node, v2))
+
+    @staticmethod
+    def _expanded_hadamard_rewrite(adj: dict[int, dict[int, bool]], hadamard: ExpandedHadamard) -> _WebRewrite:
         w1, w2, w3 = hadamard.r1_node, hadamard.r2_node, hadamard.r3_node
         w1_left, w1_right = adj[w1].keys()
         l = w1_left if w1_right == w2 else w1_right
         w3_left, w3_right = adj[w3].keys()
         r = w3_right if w3_left == w2 else w3_left
 
-        web[upair(l, hadamard.origin)] = web.get(upair(l, w1), Pauli.I)
-        web[upair(hadamard.origin, r)] = web.get(upair(r, w3), Pauli.I)
         if hadamard.origin not in adj:
             adj[hadamard.origin] = {}
         adj[l][hadamard.origin] = True
         adj[hadamard.origin][l] = True
         adj[hadamard.origin][r] = True
         adj[r][hadamard.origin] = True
-
-        web.pop(upair(l, w1), "")
-        web.pop(upair(w1, w2), "")
-        web.pop(upair(w2, w3), "")
-        web.pop(upair(w3, r), "")
         del adj[l][w1]
         del adj[w1][l]
         del adj[w1][w2]
@@ -85,12 +80,32 @@ class AdditionalNodes:
         del adj[w3][r]
         del adj[r][w3]
 
-    def remove_from(self, d: Diagram, web: dict[tuple[int, int], Pauli]) -> None:
+        moves = ((upair(l, w1), upair(l, hadamard.origin)), (upair(r, w3), upair(hadamard.origin, r)))
+        return moves, (upair(l, w1), upair(w1, w2), upair(w2, w3), upair(w3, r))
+
+    def web_rewriter(self, d: Diagram) -> Callable[[dict[tuple[int, int], Pauli]], None]:
+        """
+        :return: A function that removes the additional nodes from a web over the given diagram in place, see
+            .remove_from. How edges are rewritten only depends on the diagram, so this is determined once here and
+            merely replayed for each web.
+        """
         adj = {n1: dict.fromkeys(d.neighbors(n1), True) for n1 in d.node_indices()}
-        for id_node in self.extra_id_nodes:
-            self._remove_extra_id_node(adj, web, id_node)
-        for hadamard in self.expanded_hadamards:
-            self._remove_expanded_hadamard(adj, web, hadamard)
+        rewrites = [self._extra_id_node_rewrite(adj, id_node) for id_node in self.extra_id_nodes]
+        rewrites.extend(self._expanded_hadamard_rewrite(adj, hadamard) for hadamard in self.expanded_hadamards)
+
+        def rewrite(web: dict[tuple[int, int], Pauli]) -> None:
+            for moves, removed in rewrites:
+                # Identities are never written, so that the web only ever holds its actual support
+                for old, new in moves:
+                    if old in web:
+                        web[new] = web[old]
+                for edge in removed:
+                    web.pop(edge, None)
+
+        return rewrite
+
+    def remove_from(self, d: Diagram, web: dict[tuple[int, int], Pauli]) -> None:
+        self.web_rewriter(d)(web)
 
 
 def _place_node_between(d: Diagram, _type: NodeType, n1: int, n2: int) -> int:
@@ -124,10 +139,7 @@ def _euler_expand_edges(d: Diagram) -> Iterable[ExpandedHadamard]:
         return _w1, _w2, _w3
 
     expanded_hadamards = []
-    for v in list(d.node_indices()):
-        if d.type(v) != NodeType.H:
-            continue
-
+    for v in [n for n in d.node_indices() if d.type(n) == NodeType.H]:
         v1, v2 = d.neighbors(v)
 
         d.remove_node(v)
@@ -142,33 +154,40 @@ def _euler_expand_edges(d: Diagram) -> Iterable[ExpandedHadamard]:
 
 
 def _ensure_red_green(d: Diagram) -> Iterable[int]:
+    # Snapshot node types once, registering placed nodes as they are added
+    types = {n: d.type(n) for n in d.node_indices()}
     new_nodes = []
+
+    def place_between(_type: NodeType, n1: int, n2: int) -> int:
+        node = _place_node_between(d, _type, n1, n2)
+        types[node] = _type
+        new_nodes.append(node)
+        return node
+
     # Introduce intermediate nodes
     for s, t in list(d.edge_list()):
-        if d.type(s) == d.type(t):
-            new_type = NodeType.Z if d.type(s) == NodeType.X else NodeType.X
-            new_nodes.append(_place_node_between(d, new_type, s, t))
+        if types[s] == types[t]:
+            place_between(NodeType.Z if types[s] == NodeType.X else NodeType.X, s, t)
 
     # Introduce intermediate nodes for boundary <-> boundary connections
     for s, t in list(d.edge_list()):
-        if d.type(s) == d.type(t) and d.type(s) == NodeType.B:
-            new_nodes.append(_place_node_between(d, NodeType.X, s, t))
+        if types[s] == types[t] and types[s] == NodeType.B:
+            place_between(NodeType.X, s, t)
 
-    # Ensure boundaries are not connected to a red spider
-    boundaries = d.boundary_nodes()
-    for boundary in boundaries:
-        neighbour = next(iter(d.neighbors(boundary)))
-        if d.type(neighbour) == NodeType.X:
-            new_nodes.append(_place_node_between(d, NodeType.Z, boundary, neighbour))
+    # Ensure boundaries are not connected to a red spider. Boundaries have a single neighbour, which is tracked as nodes
+    # are placed in between.
+    boundary_neighbours = {b: next(iter(d.neighbors(b))) for b in d.boundary_nodes()}
+    for boundary, neighbour in boundary_neighbours.items():
+        if types[neighbour] == NodeType.X:
+            boundary_neighbours[boundary] = place_between(NodeType.Z, boundary, neighbour)
 
     # Ensure boundaries are not connected to green spiders with nonzero phase or more than one boundary connection
-    for boundary in boundaries:
-        neighbour = next(iter(d.neighbors(boundary)))
-        neighbour_boundaries = [v for v in d.neighbors(neighbour) if d.type(v) == NodeType.B]
-        if d.phase(neighbour) != 0 or len(neighbour_boundaries) > 1:
-            new_x = _place_node_between(d, NodeType.X, boundary, neighbour)
-            new_nodes.append(new_x)
-            new_nodes.append(_place_node_between(d, NodeType.Z, boundary, new_x))
+    num_neighbour_boundaries = Counter(boundary_neighbours.values())
+    for boundary, neighbour in boundary_neighbours.items():
+        if d.phase(neighbour) != 0 or num_neighbour_boundaries[neighbour] > 1:
+            new_x = place_between(NodeType.X, boundary, neighbour)
+            place_between(NodeType.Z, boundary, new_x)
+            num_neighbour_boundaries[neighbour] -= 1
 
     return new_nodes
 
@@ -0,0 +1,67 @@
+from fractions import Fraction
+
+from paritea.diagram import Diagram, NodeType
+
+
+def test_clone():
+    d = Diagram(additional_keys=["label"])
+    b1 = d.add_node(NodeType.B, x=0, y=0)
+    z = d.add_node(NodeType.Z, phase=Fraction(1, 2), x=1, y=0, label="z")
+    b2 = d.add_node(NodeType.B, x=2, y=0)
+    d.add_edge(b1, z)
+    d.add_edge(z, b2)
+    d.set_io([b1], [b2], virtual=False)
+
+    c = d.clone()
+    assert list(c.node_indices()) == list(d.node_indices())
+    assert list(c.edge_list()) == list(d.edge_list())
+    assert list(c.edge_indices()) == list(d.edge_indices())
+    assert c.io() == d.io()
+    assert c.label(z) == "z"
+
+    # Mutating the clone must leave the original untouched
+    c.add_to_phase(z, Fraction(1, 2))
+    c.set_x(z, 5)
+    c.set_label(z, "changed")
+    c.remove_node(b2)
+    assert d.phase(z) == Fraction(1, 2)
+    assert d.x(z) == 1
+    assert d.label(z) == "z"
+    assert d.has_node(b2)
+    assert c.phase(z) == Fraction(1, 1)
+
+
+def test_add_nodes():
+    d = Diagram()
+    b = d.add_node(NodeType.B, x=0, y=0)
+    indices = d.add_nodes([(NodeType.Z, None, 1, 0), (NodeType.X, Fraction(1, 2), None, 2)])
+
+    assert indices == [b + 1, b + 2]
+    z, x = indices
+    assert d.type(z) == NodeType.Z
+    assert d.phase(z) == Fraction(0, 1)
+    assert (d.x(z), d.y(z)) == (1, 0)
+    assert d.type(x) == NodeType.X
+    assert d.phase(x) == Fraction(1, 2)
+    assert d.y(x) == 2
+    assert d.add_nodes([]) == []
+
+
+def test_compose_twice():
+    template = Diagram()
+    z = template.add_node(NodeType.Z, x=0, y=0)
+    x = template.add_node(NodeType.X, x=1, y=0)
+    template.add_edge(z, x)
+
+    d = Diagram()
+    b = d.add_node(NodeType.B, x=0, y=0)
+    first = d.compose(template, {b: z})
+    second = d.compose(template, {first[x]: z})
+    assert d.num_nodes() == 5
+    assert d.num_edges() == 4
+
+    # Composed copies of the same diagram must not share node data
+    d.add_to_phase(first[z], Fraction(1, 2))
+    assert d.phase(first[z]) == Fraction(1, 2)
+    assert d.phase(second[z]) == Fraction(0, 1)
+    assert template.phase(z) == Fraction(0, 1)
@@ -0,0 +1,37 @@
+from paritea.equivalence.enumeration import _next_gen_strategy, prepare_atomic_faults
+
+
+def test_num_undetectable_combinations():
+    # Signatures are <boundary flips><detector flips>, here with two detectors
+    assert prepare_atomic_faults([], num_detectors=2).num_undetectable_combinations() == 1
+    assert prepare_atomic_faults([(0b0100, 1), (0b1000, 1)], num_detectors=2).num_undetectable_combinations() == 4
+    # Dependent undetectable signatures do not add to the span
+    assert (
+        prepare_atomic_faults([(0b0100, 1), (0b1000, 1), (0b1100, 2)], num_detectors=2).num_undetectable_combinations()
+        == 4
+    )
+    # Two detectable signatures flipping the same detector combine into an undetectable one, whereas a detector flipped
+    # by a single signature can never be cancelled
+    assert prepare_atomic_faults([(0b0101, 1), (0b1001, 1)], num_detectors=2).num_undetectable_combinations() == 2
+    assert prepare_atomic_faults([(0b0101, 1), (0b1010, 1)], num_detectors=2).num_undetectable_combinations() == 1
+
+
+def test_next_gen_strategy_past_saturation():
+    # nm1 spans 8 undetectable signatures, which are all generated by weight 3
+    nm1_sigs = [(0b0001, 1), (0b0010, 1), (0b0100, 1)]
+    # nm2 has the same weight 1 faults, and an additional undetectable signature 0b1000 that only arises from four
+    # detectable faults of weight 1. nm2 thus spans 16 undetectable signatures, and must be unfolded past weight 3.
+    num_detectors = 3
+    nm2_sigs = [
+        (0b0001 << num_detectors, 1),
+        (0b0010 << num_detectors, 1),
+        (0b0100 << num_detectors, 1),
+        ((0b1000 << num_detectors) | 0b001, 1),
+        (0b011, 1),
+        (0b110, 1),
+        (0b100, 1),
+    ]
+
+    assert _next_gen_strategy(nm1_sigs, nm1_sigs, 2, 0, 2, 0) is None
+    assert _next_gen_strategy(nm1_sigs, nm2_sigs, 2, 0, 2, num_detectors) == 4
+    assert _next_gen_strategy(nm2_sigs, nm1_sigs, 2, num_detectors, 2, 0) == 4
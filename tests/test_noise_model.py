@@ -0,0 +1,88 @@
+import operator
+
+import pytest
+
+from paritea import Pauli, PauliString
+from paritea.diagram import Diagram
+from paritea.noise import Fault, NoiseModel, Reducer
+
+
+def test_compile_all():
+    faults = [
+        Fault(PauliString({3: Pauli.X, 7: Pauli.Y}), frozenset({2})),
+        Fault(PauliString({5: Pauli.Z})),
+        Fault(PauliString(), frozenset({0, 2})),
+    ]
+    edge_idx_map = {3: 0, 5: 1, 7: 2}
+    detector_idx_map = {0: 1, 2: 0}
+
+    compiled = Fault.compile_all(faults, edge_idx_map, detector_idx_map)
+    for row, fault in zip(compiled, faults, strict=True):
+        assert row.tolist() == fault.compile(edge_idx_map, detector_idx_map).tolist()
+
+
+def test_to_int():
+    faults = [
+        Fault(PauliString({3: Pauli.X, 7: Pauli.Y, 5: Pauli.Z}), frozenset({2, 4})),
+        Fault(PauliString({5: Pauli.Y}), frozenset({0})),
+        Fault(PauliString({7: Pauli.Z})),
+        Fault(PauliString(), frozenset({4})),
+        Fault(PauliString()),
+    ]
+    edge_idx_map = {3: 2, 5: 0, 7: 1}
+    detector_idx_map = {0: 1, 2: 2, 4: 0}
+
+    compiled = Fault.compile_all(faults, edge_idx_map, detector_idx_map)
+    for row, fault in zip(compiled, faults, strict=True):
+        assert fault.to_int(edge_idx_map, detector_idx_map) == Fault.compiled_to_int(row)
+    # Without any detectors, the edge flips still take the same bits
+    assert faults[2].to_int(edge_idx_map, {}) == Fault.compiled_to_int(
+        Fault.compile_all(faults[2:3], edge_idx_map, {})[0]
+    )
+
+
+@pytest.mark.parametrize(
+    "fault",
+    [
+        Fault(PauliString({4: Pauli.X})),  # Below the largest mapped edge
+        Fault(PauliString({9: Pauli.Z})),  # Above the largest mapped edge
+        Fault(PauliString({3: Pauli.X}), frozenset({1})),  # Below the largest mapped detector
+    ],
+)
+def test_compile_all_missing_index(fault):
+    edge_idx_map = {3: 0, 5: 1}
+    detector_idx_map = {0: 0, 2: 1}
+
+    with pytest.raises(KeyError):
+        fault.compile(edge_idx_map, detector_idx_map)
+    with pytest.raises(KeyError):
+        Fault.compile_all([fault], edge_idx_map, detector_idx_map)
+
+
+@pytest.mark.parametrize(
+    ("reducer", "reweight_func"),
+    [
+        (Reducer.SUM, operator.add),
+        (Reducer.MAX, max),
+        (Reducer.PROB_OR, lambda a, b: a + b - a * b),
+    ],
+)
+def test_compress_reducer(reducer, reweight_func):
+    def noise_model() -> NoiseModel[float]:
+        return NoiseModel(
+            Diagram(),
+            {
+                Fault(PauliString({0: Pauli.X})): [0.1, 0.25, 0.05],
+                Fault(PauliString({1: Pauli.Z}), frozenset({0})): [0.3, 0.2],
+                Fault(PauliString({2: Pauli.Y})): [0.4],
+                Fault(PauliString()): [0.1, 0.2],  # Trivial faults are not compressed
+            },
+        )
+
+    expected, by_reducer, by_name = noise_model(), noise_model(), noise_model()
+    expected.compress(reweight_func)
+    by_reducer.compress(reducer)
+    by_name.compress(str(reducer))
+
+    assert list(by_reducer.atomic_faults_with_values()) == list(expected.atomic_faults_with_values())
+    assert list(by_name.atomic_faults_with_values()) == list(expected.atomic_faults_with_values())
@@ -19,6 +19,25 @@ def test_mult():
     assert PauliString("IIIIXXXXYYYYZZZZ") * PauliString("IXYZIXYZIXYZIXYZ") == PauliString("IXYZXIZYYZIXZYXI")
 
 
+def test_mult_symplectic():
+    # Products of strings with cached symplectic forms are taken on the bitmasks, all others on the mappings
+    pairs = [
+        ("IIIIXXXXYYYYZZZZ", "IXYZIXYZIXYZIXYZ"),
+        ("XYZ", "ZYX"),
+        ("XXXXXXXXXX", "XXXXXXXXXX"),
+        ("YIZIXIYIZIXIIIIIIIIIIY", "IZ"),
+    ]
+    for a, b in pairs:
+        merged = PauliString(a) * PauliString(b)
+        sa, sb = PauliString(a), PauliString(b)
+        sa.symplectic(), sb.symplectic()
+        assert sa * sb == merged
+        assert (sa * sb).symplectic() == merged.symplectic()
+    # Sparse strings with large indices
+    a, b = PauliString({100_000: Pauli.X, 99_999: Pauli.Z}), PauliString({100_000: Pauli.Y, 5: Pauli.Z})
+    assert a * b == {99_999: Pauli.Z, 100_000: Pauli.Z, 5: Pauli.Z}
+
+
 def test_elided_identity():
     assert PauliString("IXIIZYIX") == {1: Pauli.X, 4: Pauli.Z, 5: Pauli.Y, 7: Pauli.X}
     assert PauliString("IXIIZIX") * PauliString("XXZIYI") == {0: Pauli.X, 2: Pauli.Z, 4: Pauli.X, 6: Pauli.X}
@@ -32,3 +51,22 @@ def test_commutes():
     assert not PauliString("IZZI").commutes(PauliString("IZYI"))
     assert PauliString("IZZI").commutes(PauliString("IYXX"))
     assert not PauliString("YZZI").commutes(PauliString("XXXX"))
+
+
+def test_symplectic():
+    assert PauliString().symplectic() == (0, 0)
+    assert PauliString("IXYZ").symplectic() == (0b0110, 0b1100)
+    assert PauliString.from_symplectic(0b0110, 0b1100) == PauliString("IXYZ")
+    assert PauliString.from_symplectic(0, 0) == PauliString()
+    assert PauliString.from_symplectic(*PauliString("ZIIXIY").symplectic()) == PauliString("ZIIXIY")
+
+
+def test_compile_all():
+    idx_map = {5: 0, 3: 1, 8: 2}
+    strings = [PauliString(), PauliString({5: Pauli.X, 8: Pauli.Z}), PauliString({3: Pauli.Y})]
+    compiled = PauliString.compile_all(strings, idx_map)
+
+    assert compiled.shape == (3, 6)
+    for row, string in zip(compiled, strings):
+        assert (row == string.compile(idx_map)).all()
+    assert PauliString.compile_all([], idx_map).shape == (0, 6)
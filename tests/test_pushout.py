@@ -1,27 +1,36 @@
 import pytest
 
-from paritea import FlipOperators, build_flip_operators, generate, push_out
+from paritea import FlipOperators, PauliString, build_flip_operators, generate, push_out
 from paritea.glue.pyzx import from_pyzx
 from paritea.noise import NoiseModel
+from paritea.pushout import _anticommutation_masks, _anticommuting
+from paritea.util import bit_indices
 
 
 def group_fault_values_by_flips[T](
     nm: NoiseModel[T], flip_ops: FlipOperators
 ) -> dict[tuple[frozenset[int], frozenset[int]], list[T]]:
+    def anticommuting(fault: PauliString, generators: list[PauliString]) -> frozenset[int]:
+        # Deliberately the plain commutation check rather than the bitmasks of push_out, which it is a reference for
+        return frozenset(i for i, generator in enumerate(generators) if not fault.commutes(generator))
+
+    # Pushed out faults often only differ in their detector flips, so the generators flipped by some edge flips are
+    # computed once per (immutable and hashable) Pauli string
+    flips: dict[PauliString, tuple[frozenset[int], frozenset[int]]] = {}
+
     result: dict[tuple[frozenset[int], frozenset[int]], list[T]] = {}
     for fault, values in nm.atomic_faults_with_values():
-        flipped_stabs = frozenset(i for i, r in enumerate(flip_ops.stab_gen_set) if not fault.edge_flips.commutes(r))
-        flipped_regions = frozenset(
-            i for i, r in enumerate(flip_ops.region_gen_set) if not fault.edge_flips.commutes(r)
-        )
+        if fault.edge_flips not in flips:
+            flips[fault.edge_flips] = (
+                anticommuting(fault.edge_flips, flip_ops.stab_gen_set),
+                anticommuting(fault.edge_flips, flip_ops.region_gen_set),
+            )
+        flipped_stabs, flipped_regions = flips[fault.edge_flips]
 
         if not fault.detector_flips.isdisjoint(flipped_regions):
             raise RuntimeError("Given detector indices are not disjoint, shift the region indices saved in faults!")
 
-        key = (flipped_stabs, fault.detector_flips.union(flipped_regions))
-        if key not in result:
-            result[key] = []
-        result[key].extend(values)
+        result.setdefault((flipped_stabs, fault.detector_flips.union(flipped_regions)), []).extend(values)
 
     for values in result.values():
         values.sort()
@@ -66,6 +75,21 @@ def compare_noise_models[T](nm1: NoiseModel[T], nm2: NoiseModel[T], flip_ops: Fl
         assert nm1_grouped[flips] == nm2_grouped[flips], f"Value difference for fault flips {flips}!"
 
 
+def test_anticommutation_masks():
+    d = generate.shor_extraction(generate.steane_code_stabilisers(), qubits=7, repeat=2)
+    d.infer_io_from_boundaries()
+    flip_ops = build_flip_operators(d)
+    generators = [*flip_ops.stab_gen_set, *flip_ops.region_gen_set]
+    masks = _anticommutation_masks(generators)
+
+    # Besides single edge flips, check products of neighbouring ones, whose anticommutations must cancel out
+    edge_flips = [fault.edge_flips for fault in NoiseModel.weighted_edge_flip_noise(d).atomic_faults()]
+    edge_flips += [a * b for a, b in zip(edge_flips, edge_flips[3:])]
+    for flips in edge_flips:
+        expected = {i for i, generator in enumerate(generators) if not flips.commutes(generator)}
+        assert set(bit_indices(_anticommuting(flips, masks))) == expected
+
+
 def test_simple_zweb():
     d = from_pyzx(generate.zweb(2, 2))
     flip_ops = build_flip_operators(d)
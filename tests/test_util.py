@@ -0,0 +1,10 @@
+from paritea.util import gf2_rank
+
+
+def test_gf2_rank():
+    assert gf2_rank([]) == 0
+    assert gf2_rank([0, 0]) == 0
+    assert gf2_rank([0b001, 0b010, 0b100]) == 3
+    assert gf2_rank([0b011, 0b110, 0b101]) == 2  # The last is the sum of the others
+    assert gf2_rank([0b1010, 0b1010]) == 1
+    assert gf2_rank(iter([1 << 100, (1 << 100) | 1, 1])) == 2
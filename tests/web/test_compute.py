@@ -19,7 +19,9 @@ def _serialize(webs: list[PauliString], d: Diagram) -> list[SerializedPauliStrin
 
 
 def _deserialize(webs: list[SerializedPauliString], d: Diagram) -> list[PauliString]:
-    return [PauliString({d.edge_indices_from_endpoints(*nodes)[0]: p for nodes, p in web.items()}) for web in webs]
+    # Webs overlap a lot, so each pair of endpoints is only looked up once
+    edge_indices = {nodes: d.edge_indices_from_endpoints(*nodes)[0] for nodes in {n for web in webs for n in web}}
+    return [PauliString({edge_indices[nodes]: p for nodes, p in web.items()}) for web in webs]
 
 
 class WebFileIO:
@@ -46,10 +48,12 @@ class WebFileIO:
 
     def _read(self, ext: str) -> list[SerializedPauliString]:
         with open(f"{self.filename_template}.{ext}") as f:
-            return [
-                PauliString({tuple(map(int, str(e)[1:-1].split(","))): Pauli(p) for e, p in ps.items()})
-                for ps in json.load(f)
-            ]
+            serialized = json.load(f)
+
+        # Webs share most of their edges, so each distinct "(s,t)" key is only parsed once
+        endpoints = {e: tuple(map(int, e[1:-1].split(","))) for e in {e for ps in serialized for e in ps}}
+        # Plain mappings suffice here, as _deserialize builds the Pauli strings over edge indices
+        return [{endpoints[e]: Pauli(p) for e, p in ps.items()} for ps in serialized]
 
 
 @pytest.fixture
@@ -72,40 +76,47 @@ def generate_web_files(web_io: WebFileIO) -> Callable[[Diagram, list[PauliString
 
 @pytest.fixture
 def assert_pauli_webs(web_io: WebFileIO) -> Callable[[Diagram, list[PauliString], list[PauliString]], None]:
-    def _assert(d: Diagram, stabs: list[PauliString], regions: list[PauliString]) -> None:
-        edge_idx_map = {e: i for i, e in enumerate(d.edge_indices())}
+    # Tests assert webs of the same diagram repeatedly, so its edge map and row reduced expected webs are computed once
+    expected: dict[int, tuple[dict[int, int], GF2, GF2]] = {}
 
-        compiled_stabs = GF2([web.compile(edge_idx_map) for web in stabs])
-        compiled_regions = GF2([web.compile(edge_idx_map) for web in regions])
-        compiled_exp_stabs = GF2([web.compile(edge_idx_map) for web in web_io.read_stabilising(d)])
-        compiled_exp_regions = GF2([web.compile(edge_idx_map) for web in web_io.read_detecting(d)])
+    def _compile(webs: list[PauliString], edge_idx_map: Mapping[int, int]) -> GF2:
+        return GF2(PauliString.compile_all(webs, edge_idx_map))
 
-        try:
-            assert len(compiled_regions) == len(compiled_exp_regions)
-            if len(compiled_regions) > 0:
-                cr_rref = compiled_regions.row_reduce()
-                cer_rref = compiled_exp_regions.row_reduce()
+    def _reduce(compiled_stabs: GF2, compiled_regions: GF2) -> tuple[GF2, GF2]:
+        """:return: The row reduced detecting web space and the row reduced space of all webs"""
+        # Stabilising web spaces must only be equal modulo the detecting web spaces. Thus, test the entire Pauli web
+        # space for equality, which yields the property under test combined with detecting web space equality.
+        if len(compiled_regions) == 0:
+            return compiled_regions, compiled_stabs.row_reduce()
+
+        # The reduced detecting webs span the same space as the compiled ones, with sparser rows
+        regions_rref = compiled_regions.row_reduce()
+        return regions_rref, GF2(np.vstack([regions_rref, compiled_stabs])).row_reduce()
+
+    def _assert(d: Diagram, stabs: list[PauliString], regions: list[PauliString]) -> None:
+        if id(d) not in expected:
+            edge_idx_map = {e: i for i, e in enumerate(d.edge_indices())}
+            expected[id(d)] = (
+                edge_idx_map,
+                *_reduce(
+                    _compile(web_io.read_stabilising(d), edge_idx_map), _compile(web_io.read_detecting(d), edge_idx_map)
+                ),
+            )
+        edge_idx_map, cer_rref, exp_web_space_rref = expected[id(d)]
+        cr_rref, web_space_rref = _reduce(_compile(stabs, edge_idx_map), _compile(regions, edge_idx_map))
 
-                cr_nonzero = [row for row in cr_rref if any(row)]
-                cer_nonzero = [row for row in cer_rref if any(row)]
+        try:
+            assert len(cr_rref) == len(cer_rref)
+            if len(cr_rref) > 0:
+                cr_nonzero = cr_rref[np.asarray(cr_rref).any(axis=1)]
+                cer_nonzero = cer_rref[np.asarray(cer_rref).any(axis=1)]
 
                 assert len(cr_nonzero) == len(cr_rref)
                 assert len(cer_nonzero) == len(cer_rref)
 
                 assert np.array_equal(cr_rref, cer_rref), "Region spaces are not equal"
 
-            # Stabilising web spaces must only be equal modulo the detecting web spaces. Thus, test the entire Pauli web
-            # space for equality, which yields the property under test combined with detecting web space equality.
-            if len(compiled_regions) > 0:
-                web_space_basis = GF2(np.vstack([compiled_stabs, compiled_regions]))
-                exp_web_space_basis = GF2(np.vstack([compiled_exp_stabs, compiled_exp_regions]))
-            else:
-                web_space_basis = compiled_stabs
-                exp_web_space_basis = compiled_exp_stabs
-
-            assert np.array_equal(web_space_basis.row_reduce(), exp_web_space_basis.row_reduce()), (
-                "Web spaces are not equal"
-            )
+            assert np.array_equal(web_space_rref, exp_web_space_rref), "Web spaces are not equal"
         except AssertionError:
             web_io.write_stabilising(stabs, d, file_name_suffix="_actual")
             web_io.write_detecting(regions, d, file_name_suffix="_actual")
@@ -150,3 +161,38 @@ def test_rotated_surface_code_shor(code_size, repeat, assert_pauli_webs):
     assert_pauli_webs(d, stabs, regions)
     stabs, regions = pauli_webs_through_partitions(d, partitions=partitions)
     assert_pauli_webs(d, stabs, regions)
+
+
+def test_rotated_surface_code_shor_minimal_cat_state(assert_pauli_webs):
+    d, partitions = generate.shor_extraction(
+        generate.rotated_planar_surface_code_stabilisers(3),
+        qubits=9,
+        repeat=2,
+        partition=True,
+        minimal_cat_state=True,
+    )
+
+    stabs, regions = compute_pauli_webs(d)
+    assert_pauli_webs(d, stabs, regions)
+    stabs, regions = pauli_webs_through_partitions(d, partitions=partitions)
+    assert_pauli_webs(d, stabs, regions)
+
+
+def test_pauli_webs_through_partitions_in_parallel(web_io, assert_pauli_webs):
+    web_io.filename_template = "tests/web/rotated_surface_code_shor[3-1]"
+    d, partitions = generate.shor_extraction(
+        generate.rotated_planar_surface_code_stabilisers(3),
+        qubits=9,
+        repeat=1,
+        partition=True,
+    )
+    # Halve the partitions, so that there are distinct subdiagrams to hand out to the worker processes
+    partitions = [half for part in partitions for half in (part[: len(part) // 2], part[len(part) // 2 :])]
+
+    # Webs are only unique up to the spaces they span, which assert_pauli_webs compares
+    stabs, regions = pauli_webs_through_partitions(d, partitions=partitions, n_jobs=1)
+    assert_pauli_webs(d, stabs, regions)
+    stabs, regions = pauli_webs_through_partitions(d, partitions=partitions, n_jobs=2)
+    assert_pauli_webs(d, stabs, regions)
+    with pytest.raises(ValueError, match="n_jobs"):
+        pauli_webs_through_partitions(d, partitions=partitions, n_jobs=0)
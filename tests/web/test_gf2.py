@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from galois import GF2
+
+from paritea.web._gf2 import (
+    combine_rows_u64,
+    null_space_from_rref_u64,
+    null_space_u64,
+    pack_rows,
+    pivot_columns_u64,
+    rref_transform_u64,
+    rref_u64,
+    unpack_rows,
+)
+
+# Column counts around word boundaries, an empty matrix, and matrices of rank zero and full rank
+SHAPES = [(5, 3), (12, 64), (9, 65), (40, 130), (70, 20), (0, 10)]
+
+
+def _random_matrices(shape: tuple[int, int]) -> list[np.ndarray]:
+    rng = np.random.default_rng(sum(shape))
+    return [
+        rng.integers(0, 2, size=shape, dtype=np.uint8),
+        # Sparse, such that some columns are not pivots and rows are dependent
+        (rng.random(shape) < 0.1).astype(np.uint8),
+        np.zeros(shape, dtype=np.uint8),
+    ]
+
+
+def _nonzero_rows(m: GF2) -> np.ndarray:
+    m = np.asarray(m)
+    return m[m.any(axis=1)]
+
+
+def _pivots(rref: np.ndarray) -> list[int]:
+    return [int(np.argmax(row)) for row in rref]
+
+
+@pytest.fixture(params=SHAPES, ids=lambda shape: f"{shape[0]}x{shape[1]}")
+def matrices(request) -> list[np.ndarray]:
+    return _random_matrices(request.param)
+
+
+def test_pack_rows(matrices):
+    for m in matrices:
+        packed = pack_rows(m)
+        assert packed.shape == (m.shape[0], (m.shape[1] + 63) // 64)
+        assert np.array_equal(unpack_rows(packed, m.shape[1]), m)
+        # Leading columns only read the words holding them
+        assert np.array_equal(unpack_rows(packed, m.shape[1] // 2), m[:, : m.shape[1] // 2])
+
+
+def test_rref_u64(matrices):
+    for m in matrices:
+        expected = _nonzero_rows(GF2(m).row_reduce())
+        reduced, pivot_cols = rref_u64(pack_rows(m), m.shape[1])
+
+        assert np.array_equal(unpack_rows(reduced, m.shape[1]), expected)
+        assert pivot_cols == _pivots(expected)
+        assert pivot_columns_u64(pack_rows(m), m.shape[1]) == pivot_cols
+
+
+def test_rref_transform_u64(matrices):
+    for m in matrices:
+        expected = GF2(m).row_reduce()
+        transform, rank = rref_transform_u64(pack_rows(m), m.shape[1])
+
+        assert transform.shape == (m.shape[0], m.shape[0])
+        assert rank == len(_nonzero_rows(expected))
+        assert np.linalg.matrix_rank(GF2(transform)) == m.shape[0]
+        assert np.array_equal(GF2(transform) @ GF2(m), expected)
+
+
+def test_null_space_u64(matrices):
+    for m in matrices:
+        expected = GF2(m).null_space().row_reduce()
+        null_space = unpack_rows(null_space_u64(pack_rows(m), m.shape[1]), m.shape[1])
+
+        assert np.array_equal(GF2(null_space).row_reduce(), expected)
+        assert not (GF2(m) @ GF2(null_space).T).any()
+
+        reduced, pivot_cols = rref_u64(pack_rows(m), m.shape[1])
+        from_rref = unpack_rows(null_space_from_rref_u64(reduced, pivot_cols, m.shape[1]), m.shape[1])
+        assert np.array_equal(from_rref, null_space)
+
+
+def test_combine_rows_u64(matrices):
+    rng = np.random.default_rng(0)
+    for m in matrices:
+        for selection in (
+            rng.integers(0, 2, size=(7, m.shape[0]), dtype=np.uint8),
+            np.zeros((3, m.shape[0]), dtype=np.uint8),
+        ):
+            combined = combine_rows_u64(selection, pack_rows(m))
+            assert np.array_equal(unpack_rows(combined, m.shape[1]), GF2(selection) @ GF2(m))